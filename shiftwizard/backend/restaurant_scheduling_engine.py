@@ -22,18 +22,42 @@ Date: 2025-10-20
 """
 
 from ortools.sat.python import cp_model
-from typing import List, Dict, Tuple, Optional, Set, Any
+from typing import List, Dict, Tuple, Optional, Set, FrozenSet, Any, Iterator
 from dataclasses import dataclass, field
-from datetime import datetime, time, timedelta
+from functools import lru_cache
 from enum import Enum
 import json
-import random
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+log = logging.getLogger(__name__)
 
 
 # ============================================================================
 # RESTAURANT-SPECIFIC DATA STRUCTURES
 # ============================================================================
 
+@lru_cache(maxsize=4096)
+def _parse_hhmm(value: str) -> int:
+    """Parse an "HH:MM" string into minutes since midnight (memoized)."""
+    hh, mm = value.split(":")
+    return int(hh) * 60 + int(mm)
+
+
+# Longest run of consecutive set bits for every byte value. With bit d of a
+# worker's day mask meaning "works on day d", one table lookup gives the
+# longest stretch of consecutive working days in the week.
+LONGEST_RUN = np.array(
+    [max(len(run) for run in format(b, "b").split("0")) for b in range(256)],
+    dtype=np.uint8
+)
+
+
 class RestaurantRole(Enum):
     """Restaurant-specific job roles."""
     SERVER = "Server"
@@ -57,7 +81,34 @@ class ShiftType(Enum):
     DOUBLE = "Double"       # Double shift (lunch + dinner)
 
 
-@dataclass
+# Integer shadows of ShiftType for array-based hot paths (enum order)
+SHIFT_PREP, SHIFT_OPENING, SHIFT_LUNCH, SHIFT_DINNER, SHIFT_CLOSING, SHIFT_DOUBLE = range(6)
+_SHIFT_ENUM_TO_INT: Dict[ShiftType, int] = {shift_type: i for i, shift_type in enumerate(ShiftType)}
+_SHIFT_TYPE_BY_NAME: Dict[str, ShiftType] = {shift_type.value: shift_type for shift_type in ShiftType}
+
+
+def infer_shift_type(explicit_type: Optional[str], start_time: str) -> ShiftType:
+    """
+    Resolve a shift type from its explicit name, or infer it from the start time.
+
+    Unknown explicit names fall back to LUNCH.
+    """
+    if explicit_type:
+        return _SHIFT_TYPE_BY_NAME.get(explicit_type, ShiftType.LUNCH)
+
+    start_hour = _parse_hhmm(start_time) // 60
+
+    if start_hour < 8:
+        return ShiftType.PREP
+    elif start_hour < 11:
+        return ShiftType.OPENING
+    elif start_hour < 17:
+        return ShiftType.LUNCH  # Lunch and late lunch
+    else:
+        return ShiftType.DINNER
+
+
+@dataclass(slots=True)
 class RestaurantShift:
     """
     Enhanced shift structure for restaurant scheduling.
@@ -81,23 +132,33 @@ class RestaurantShift:
     requires_opening_duties: bool = False
     requires_closing_duties: bool = False
 
-    @property
-    def duration_hours(self) -> float:
-        """Calculate shift duration in hours."""
-        start = datetime.strptime(self.start_time, "%H:%M")
-        end = datetime.strptime(self.end_time, "%H:%M")
+    # Derived on construction so hot paths never re-parse the time strings
+    start_min: int = field(init=False, repr=False, compare=False)
+    end_min: int = field(init=False, repr=False, compare=False)
+    end_min_wrapped: int = field(init=False, repr=False, compare=False)
+    duration_min: int = field(init=False, repr=False, compare=False)
+    duration_hours: float = field(init=False, repr=False, compare=False)
+
+    # Position in the week and integer shift type, assigned by
+    # RestaurantSchedulingData.add_shift
+    day_idx: int = field(init=False, default=-1, repr=False, compare=False)
+    shift_type_id: int = field(init=False, default=-1, repr=False, compare=False)
 
-        if end < start:
-            end += timedelta(days=1)
+    def __post_init__(self):
+        """Pre-parse start/end times into minutes since midnight."""
+        self.start_min = _parse_hhmm(self.start_time)
+        self.end_min = _parse_hhmm(self.end_time)
 
-        duration = (end - start).total_seconds() / 3600
-        return duration
+        # Overnight shifts wrap past midnight
+        self.end_min_wrapped = self.end_min + 1440 if self.end_min < self.start_min else self.end_min
+        self.duration_min = self.end_min_wrapped - self.start_min
+        self.duration_hours = self.duration_min / 60.0
 
     def __str__(self):
         return f"{self.shift_id} ({self.day} {self.start_time}-{self.end_time} {self.shift_type.value})"
 
 
-@dataclass
+@dataclass(slots=True)
 class BudgetConstraint:
     """
     Budget constraints for scheduling periods.
@@ -112,7 +173,7 @@ class BudgetConstraint:
     target_cost: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FairnessConstraints:
     """
     Fairness and balance constraints for shift distribution.
@@ -129,6 +190,132 @@ class FairnessConstraints:
     min_rest_hours: float = 10.0
 
 
+@dataclass(slots=True)
+class SolverConfig:
+    """
+    CP-SAT search parameters used by RestaurantSchedulerModel.
+
+    Attributes:
+        num_workers: Parallel search workers. CP-SAT runs its generic
+            searches on the first few and LNS on the rest, so it is sized
+            to the host (capped at 16) rather than fixed
+        interleave_search: Interleave subsolvers in deterministic batches
+            (reproducible, but much slower on small models)
+        linearization_level: CP-SAT linearization level (None = solver default)
+        random_seed: Fix for reproducible runs (None = solver default)
+        log_search_progress: Let CP-SAT print its search log
+    """
+    num_workers: int = field(default_factory=lambda: min(os.cpu_count() or 4, 16))
+    interleave_search: bool = False
+    linearization_level: Optional[int] = None
+    random_seed: Optional[int] = None
+    log_search_progress: bool = False
+
+    def apply(self, solver: cp_model.CpSolver):
+        """Copy these settings onto a solver's parameters."""
+        params = solver.parameters
+        params.num_workers = self.num_workers
+        params.interleave_search = self.interleave_search
+        params.log_search_progress = self.log_search_progress
+        if self.linearization_level is not None:
+            params.linearization_level = self.linearization_level
+        if self.random_seed is not None:
+            params.random_seed = self.random_seed
+
+
+# ============================================================================
+# SHIFT PAIR RULES
+# ============================================================================
+
+def shifts_overlap(day: np.ndarray, start: np.ndarray, end: np.ndarray, a, b):
+    """
+    Check if shifts a and b overlap.
+
+    Args:
+        day, start, end: Per-shift day index, start minute and wrapped end
+            minute (past 1440 for overnight shifts)
+        a, b: Shift indices or equal-length index arrays
+
+    Returns:
+        bool, or bool array matching a and b
+    """
+    return (day[a] == day[b]) & (start[a] < end[b]) & (start[b] < end[a])
+
+
+def insufficient_rest(day: np.ndarray, start: np.ndarray, end: np.ndarray, a, b, min_rest_hours: float):
+    """
+    Check if there's insufficient rest between shifts a and b.
+
+    Args:
+        day, start, end: As for shifts_overlap
+        a, b: Shift indices or equal-length index arrays
+        min_rest_hours: Minimum hours between the end of one shift and the
+            start of the next
+
+    Returns:
+        bool, or bool array matching a and b
+    """
+    day_delta = day[b] - day[a]
+
+    # Minutes from the start of a's day; overnight ends run past 1440
+    start_a = start[a]
+    start_b = start[b] + day_delta * 1440
+    end_a = end[a]
+    end_b = start_b + (end[b] - start[b])
+
+    # Measure from whichever shift starts first
+    rest_minutes = np.where(start_a <= start_b, start_b - end_a, start_a - end_b)
+
+    # Only check consecutive or same day
+    return (np.abs(day_delta) <= 1) & (rest_minutes > 0) & (rest_minutes < min_rest_hours * 60)
+
+
+@lru_cache(maxsize=8)
+def _conflict_pair_tables(shift_times: Tuple[Tuple[int, int, int], ...], n_days: int,
+                          min_rest_hours: float) -> Tuple[Tuple[np.ndarray, ...], np.ndarray, np.ndarray]:
+    """
+    Bucket shifts by day and find the overlapping and insufficient-rest pairs.
+
+    Shifts only overlap within a day and rest only binds across the same or
+    the next day, so pairs are drawn from single buckets and adjacent bucket
+    pairs instead of every pair of shifts in the week. Candidate pairs are
+    tested as whole arrays. Memoized on the shift times, so models rebuilt
+    over the same shifts skip the work; the returned arrays are read-only.
+
+    Args:
+        shift_times: (day_idx, start_min, wrapped end_min) per shift
+        n_days: Days in the week
+        min_rest_hours: Minimum rest between shifts
+
+    Returns:
+        (shift indices per day, overlap pairs, rest pairs); pairs are
+        (n_pairs, 2) index arrays with a < b in every row
+    """
+    day, start, end = np.array(shift_times, dtype=np.int64).reshape(-1, 3).T
+    shifts_by_day = tuple(np.flatnonzero(day == d) for d in range(n_days))
+
+    same_day = []
+    next_day = []
+    for day_idx, bucket in enumerate(shifts_by_day):
+        upper_a, upper_b = np.triu_indices(len(bucket), k=1)
+        same_day.append(np.stack([bucket[upper_a], bucket[upper_b]], axis=1))
+
+        if day_idx + 1 < n_days:
+            grid_a, grid_b = np.meshgrid(bucket, shifts_by_day[day_idx + 1], indexing="ij")
+            next_day.append(np.stack([grid_a.ravel(), grid_b.ravel()], axis=1))
+
+    same_day = np.concatenate(same_day).reshape(-1, 2)
+    next_day = np.sort(np.concatenate(next_day).reshape(-1, 2), axis=1)
+
+    overlap_pairs = same_day[shifts_overlap(day, start, end, same_day[:, 0], same_day[:, 1])]
+    candidates = np.concatenate([same_day, next_day])
+    rest_pairs = candidates[insufficient_rest(day, start, end, candidates[:, 0], candidates[:, 1], min_rest_hours)]
+
+    for table in (*shifts_by_day, overlap_pairs, rest_pairs):
+        table.setflags(write=False)
+    return shifts_by_day, overlap_pairs, rest_pairs
+
+
 # ============================================================================
 # ENHANCED SCHEDULING INPUT DATA
 # ============================================================================
@@ -145,8 +332,12 @@ class RestaurantSchedulingData:
         self.shifts: List[RestaurantShift] = []
         self.roles: List[str] = []
 
+        # Lookup indexes kept in sync by add_shift
+        self._shift_by_id: Dict[str, RestaurantShift] = {}
+        self._roles_set: Set[str] = set()
+
         # Worker attributes
-        self.worker_skills: Dict[str, List[str]] = {}
+        self.worker_skills: Dict[str, FrozenSet[str]] = {}
         self.worker_availability: Dict[str, List['TimeSlot']] = {}
         self.labor_cost: Dict[str, float] = {}
         self.max_hours_per_week: Dict[str, float] = {}
@@ -161,6 +352,28 @@ class RestaurantSchedulingData:
 
         # NEW: Day-of-week mapping for consecutive day tracking
         self.days_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+        self.day_to_idx: Dict[str, int] = {day: i for i, day in enumerate(self.days_order)}
+
+        # Dense lookups built by finalize(); any add_* call marks them stale
+        self.worker_idx: Dict[str, int] = {}
+        self.shift_idx: Dict[str, int] = {}
+        self.can_work: np.ndarray = np.zeros((0, 0), dtype=np.bool_)
+
+        # Structure-of-arrays views indexed by worker_idx / shift_idx
+        self.labor_cost_arr: np.ndarray = np.zeros(0, dtype=np.float64)
+        self.max_hours_arr: np.ndarray = np.zeros(0, dtype=np.float64)
+        self.min_hours_arr: np.ndarray = np.zeros(0, dtype=np.float64)
+        self.shift_duration_arr: np.ndarray = np.zeros(0, dtype=np.float64)
+        self.shift_minutes_arr: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.shift_day_arr: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.shift_day_bits: np.ndarray = np.zeros(0, dtype=np.uint8)
+        self.shift_type_arr: np.ndarray = np.zeros(0, dtype=np.int64)
+
+        # One bit per distinct skill/role; worker masks are Python ints held
+        # in an object array so any number of skills fits
+        self.skill_bit: Dict[str, int] = {}
+        self.worker_skill_mask: np.ndarray = np.zeros(0, dtype=object)
+        self._finalized = False
 
     def set_budget_constraint(self, max_total_cost: float, max_daily_cost: Optional[float] = None, target_cost: Optional[float] = None):
         """Set budget constraints."""
@@ -178,34 +391,158 @@ class RestaurantSchedulingData:
     def add_worker(self, worker_id: str, skills: List[str], hourly_rate: float, max_hours: float = 40.0, min_hours: float = 0.0):
         """Add a worker to the scheduling system."""
         self.workers.append(worker_id)
-        self.worker_skills[worker_id] = skills
+        self._finalized = False
+        self.worker_skills[worker_id] = frozenset(skills)
         self.labor_cost[worker_id] = hourly_rate
         self.max_hours_per_week[worker_id] = max_hours
         self.min_hours_per_week[worker_id] = min_hours
 
     def add_shift(self, shift: RestaurantShift, requirements: List['ShiftRequirement']):
         """Add a shift with its staffing requirements."""
+        if shift.day not in self.day_to_idx:
+            raise ValueError(f"Shift {shift.shift_id} has unknown day '{shift.day}'")
+        shift.day_idx = self.day_to_idx[shift.day]
+        shift.shift_type_id = _SHIFT_ENUM_TO_INT[shift.shift_type]
+
+        self._finalized = False
         self.shifts.append(shift)
+        self._shift_by_id[shift.shift_id] = shift
         self.shift_requirements[shift.shift_id] = requirements
 
-        # Track unique roles
+        # Track unique roles (set for dedup, list keeps first-seen order)
         for req in requirements:
-            if req.role not in self.roles:
+            if req.role not in self._roles_set:
+                self._roles_set.add(req.role)
                 self.roles.append(req.role)
 
+    def bulk_load(self, workers: List[Dict[str, Any]], shifts: List[Dict[str, Any]]):
+        """
+        Load workers and shifts from JSON records in bulk, then finalize().
+
+        Records use the runner's input format. Worker attributes are filled
+        with one comprehension per dict instead of an add_worker call per
+        row; shifts go through add_shift so day/role indexing stays in one
+        place.
+
+        Args:
+            workers: Records with id, skills, hourly_rate, max_hours,
+                min_hours and availability [{day, start_time, end_time}]
+            shifts: Records with id, day, start_time, end_time, optional
+                shift_type/section/duty flags and requirements
+                [{role, count, required_skill}]
+        """
+        self._finalized = False
+        self.workers.extend(w["id"] for w in workers)
+        self.worker_skills.update({w["id"]: frozenset(w.get("skills", ())) for w in workers})
+        self.labor_cost.update({w["id"]: float(w.get("hourly_rate", 15.0)) for w in workers})
+        self.max_hours_per_week.update({w["id"]: float(w.get("max_hours", 40.0)) for w in workers})
+        self.min_hours_per_week.update({w["id"]: float(w.get("min_hours", 0.0)) for w in workers})
+        self.worker_availability.update({
+            w["id"]: [TimeSlot(slot["day"], slot["start_time"], slot["end_time"]) for slot in w["availability"]]
+            for w in workers if w.get("availability")
+        })
+
+        for row in shifts:
+            shift = RestaurantShift(
+                shift_id=row["id"],
+                day=row["day"],
+                start_time=row["start_time"],
+                end_time=row["end_time"],
+                shift_type=infer_shift_type(row.get("shift_type"), row["start_time"]),
+                section=row.get("section"),
+                requires_opening_duties=row.get("requires_opening_duties", False),
+                requires_closing_duties=row.get("requires_closing_duties", False)
+            )
+            requirements = [
+                ShiftRequirement(req["role"], int(req["count"]), req.get("required_skill"))
+                for req in row.get("requirements", [])
+            ]
+            self.add_shift(shift, requirements)
+
+        self.finalize()
+
     def add_availability(self, worker_id: str, time_slots: List['TimeSlot']):
         """Set availability for a worker."""
         self.worker_availability[worker_id] = time_slots
+        self._finalized = False
 
     def get_shift(self, shift_id: str) -> Optional[RestaurantShift]:
         """Retrieve a shift by ID."""
-        for shift in self.shifts:
-            if shift.shift_id == shift_id:
-                return shift
-        return None
+        return self._shift_by_id.get(shift_id)
+
+    def finalize(self):
+        """
+        Build integer indexes, per-worker/per-shift arrays and the
+        worker x shift availability matrix.
+
+        Call once after all workers, shifts and availability are loaded.
+        Lookups call it lazily if the data changed since the last build.
+        """
+        n_workers = len(self.workers)
+        self.worker_idx = {worker_id: i for i, worker_id in enumerate(self.workers)}
+        self.shift_idx = {shift.shift_id: j for j, shift in enumerate(self.shifts)}
+
+        self.labor_cost_arr = np.fromiter((self.labor_cost[w] for w in self.workers), dtype=np.float64, count=n_workers)
+        self.max_hours_arr = np.fromiter((self.max_hours_per_week[w] for w in self.workers), dtype=np.float64, count=n_workers)
+        self.min_hours_arr = np.fromiter((self.min_hours_per_week[w] for w in self.workers), dtype=np.float64, count=n_workers)
+        self.shift_duration_arr = np.fromiter((s.duration_hours for s in self.shifts), dtype=np.float64, count=len(self.shifts))
+        self.shift_minutes_arr = np.fromiter((s.duration_min for s in self.shifts), dtype=np.int64, count=len(self.shifts))
+        self.shift_day_arr = np.fromiter((s.day_idx for s in self.shifts), dtype=np.int64, count=len(self.shifts))
+        self.shift_day_bits = np.left_shift(1, self.shift_day_arr).astype(np.uint8)
+        self.shift_type_arr = np.fromiter((s.shift_type_id for s in self.shifts), dtype=np.int64, count=len(self.shifts))
+
+        # Roles and required skills get bits too, so a requirement nobody
+        # holds still has a mask that no worker matches
+        self.skill_bit = {}
+        for w in self.workers:
+            for skill in self.worker_skills.get(w, ()):
+                self.skill_bit.setdefault(skill, 1 << len(self.skill_bit))
+        for requirements in self.shift_requirements.values():
+            for req in requirements:
+                for skill in (req.role, req.required_skill):
+                    if skill is not None:
+                        self.skill_bit.setdefault(skill, 1 << len(self.skill_bit))
+        self.worker_skill_mask = np.array(
+            [sum(self.skill_bit[skill] for skill in self.worker_skills.get(w, ())) for w in self.workers],
+            dtype=object
+        )
+
+        # Availability: test every (slot, shift) pair in one broadcast - same
+        # rule as TimeSlot.overlaps_with_shift - then OR the rows per worker
+        slots = [(i, slot) for i, w in enumerate(self.workers) for slot in self.worker_availability.get(w, [])]
+        slot_worker = np.fromiter((i for i, _ in slots), dtype=np.int64, count=len(slots))
+        slot_day = np.fromiter((self.day_to_idx.get(slot.day, -1) for _, slot in slots), dtype=np.int64, count=len(slots))
+        slot_start = np.fromiter((slot.start_min for _, slot in slots), dtype=np.int64, count=len(slots))
+        slot_end = np.fromiter((slot.end_min_wrapped for _, slot in slots), dtype=np.int64, count=len(slots))
+
+        shift_start = np.fromiter((s.start_min for s in self.shifts), dtype=np.int64, count=len(self.shifts))
+        shift_end = np.fromiter((s.end_min_wrapped for s in self.shifts), dtype=np.int64, count=len(self.shifts))
+
+        covers = ((slot_day[:, None] == self.shift_day_arr[None, :]) &
+                  (slot_start[:, None] <= shift_start[None, :]) &
+                  (slot_end[:, None] >= shift_end[None, :]))
+
+        self.can_work = np.zeros((n_workers, len(self.shifts)), dtype=np.bool_)
+        if slots:
+            # Slots are grouped by worker, so each worker's rows are contiguous
+            slot_counts = np.bincount(slot_worker, minlength=n_workers)
+            has_slots = slot_counts > 0
+            group_starts = (np.cumsum(slot_counts) - slot_counts)[has_slots]
+            self.can_work[has_slots] = np.logical_or.reduceat(covers, group_starts, axis=0)
+
+        self._finalized = True
 
     def worker_can_work_shift(self, worker_id: str, shift: RestaurantShift) -> bool:
         """Check if a worker is available for a specific shift."""
+        if not self._finalized:
+            self.finalize()
+
+        i = self.worker_idx.get(worker_id)
+        j = self.shift_idx.get(shift.shift_id)
+        if i is not None and j is not None:
+            return bool(self.can_work[i, j])
+
+        # Worker or shift not registered with this data set - check directly
         if worker_id not in self.worker_availability:
             return False
 
@@ -214,47 +551,109 @@ class RestaurantSchedulingData:
                 return True
         return False
 
+    def available_workers(self, shift_id: str) -> List[str]:
+        """IDs of the workers available for a shift, in self.workers order."""
+        if not self._finalized:
+            self.finalize()
+        j = self.shift_idx.get(shift_id)
+        if j is None:
+            return []
+        return [self.workers[i] for i in np.flatnonzero(self.can_work[:, j]).tolist()]
+
     def worker_has_skill(self, worker_id: str, skill: str) -> bool:
         """Check if a worker possesses a specific skill."""
         if skill is None:
             return True
-        return skill in self.worker_skills.get(worker_id, [])
+        if not self._finalized:
+            self.finalize()
+        w_idx = self.worker_idx.get(worker_id)
+        if w_idx is None:
+            return False
+        return bool(self.worker_skill_mask[w_idx] & self.skill_bit.get(skill, 0))
+
+    def requirement_mask(self, requirement: 'ShiftRequirement') -> int:
+        """Skill bits a worker needs to fill a requirement (role and required_skill)."""
+        if not self._finalized:
+            self.finalize()
+        mask = self.skill_bit[requirement.role]
+        if requirement.required_skill is not None:
+            mask |= self.skill_bit[requirement.required_skill]
+        return mask
+
+    def requirement_eligibility(self, requirements: List['ShiftRequirement']) -> np.ndarray:
+        """
+        Skill match of every worker against a list of requirements.
+
+        Availability is not checked; combine with can_work for that.
+
+        Returns:
+            (n_workers, len(requirements)) bool matrix
+        """
+        needed = np.array([self.requirement_mask(req) for req in requirements], dtype=object)
+        return ((self.worker_skill_mask[:, None] & needed[None, :]) == needed[None, :]).astype(np.bool_)
+
+    def make_empty_assignment(self) -> np.ndarray:
+        """
+        Create an empty candidate schedule.
+
+        Candidates are (n_workers, n_shifts) uint8 matrices indexed by
+        worker_idx / shift_idx: one byte per cell, so local search moves are
+        single-cell writes and cost/hours deltas are plain array lookups.
+        """
+        if not self._finalized:
+            self.finalize()
+        return np.zeros((len(self.workers), len(self.shifts)), dtype=np.uint8)
+
+    def consecutive_days_ok(self, day_masks: np.ndarray) -> np.ndarray:
+        """
+        Check max_consecutive_days for many day bitmasks at once.
+
+        Mirrors the CP-SAT window rule (at most k worked days in any k+1):
+        no run of set bits may be longer than k. The FFD construction and
+        Tabu Search both check moves through here.
+
+        Args:
+            day_masks: Integer array; bit d set means the worker works day d
+
+        Returns:
+            bool array, True where the mask is allowed
+        """
+        return LONGEST_RUN[day_masks] <= self.fairness_constraints.max_consecutive_days
 
     def get_day_index(self, day: str) -> int:
         """Get numeric index for day of week."""
-        return self.days_order.index(day)
+        return self.day_to_idx[day]
 
 
 # ============================================================================
 # IMPORT COMPATIBILITY STRUCTURES FROM BASE ENGINE
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class TimeSlot:
     """Worker's available time period."""
     day: str
     start_time: str
     end_time: str
 
-    def overlaps_with_shift(self, shift: RestaurantShift) -> bool:
-        """Check if this availability slot covers the given shift."""
-        if self.day != shift.day:
-            return False
-
-        avail_start = datetime.strptime(self.start_time, "%H:%M")
-        avail_end = datetime.strptime(self.end_time, "%H:%M")
-        shift_start = datetime.strptime(shift.start_time, "%H:%M")
-        shift_end = datetime.strptime(shift.end_time, "%H:%M")
+    start_min: int = field(init=False, repr=False, compare=False)
+    end_min: int = field(init=False, repr=False, compare=False)
+    end_min_wrapped: int = field(init=False, repr=False, compare=False)
 
-        if shift_end < shift_start:
-            shift_end += timedelta(days=1)
-        if avail_end < avail_start:
-            avail_end += timedelta(days=1)
+    def __post_init__(self):
+        """Pre-parse start/end times into minutes since midnight."""
+        self.start_min = _parse_hhmm(self.start_time)
+        self.end_min = _parse_hhmm(self.end_time)
+        self.end_min_wrapped = self.end_min + 1440 if self.end_min < self.start_min else self.end_min
 
-        return avail_start <= shift_start and avail_end >= shift_end
+    def overlaps_with_shift(self, shift: RestaurantShift) -> bool:
+        """Check if this availability slot covers the given shift."""
+        return (self.day == shift.day and
+                self.start_min <= shift.start_min and
+                self.end_min_wrapped >= shift.end_min_wrapped)
 
 
-@dataclass
+@dataclass(slots=True)
 class ShiftRequirement:
     """Staffing requirements for a specific role in a shift."""
     role: str
@@ -277,30 +676,72 @@ class RestaurantSchedulerModel:
     constraints and multi-objective optimization.
     """
 
-    def __init__(self, data: RestaurantSchedulingData):
+    def __init__(self, data: RestaurantSchedulingData, config: Optional[SolverConfig] = None):
         """Initialize the enhanced scheduler."""
         self.data = data
+        self.config = config or SolverConfig()
         self.model = cp_model.CpModel()
         self.solver = cp_model.CpSolver()
 
-        # Decision variables
-        self.x: Dict[str, Dict[str, cp_model.IntVar]] = {}
+        # Decision variables in CSR layout: worker w_idx owns positions
+        # x_indptr[w_idx]:x_indptr[w_idx + 1] of x_vars / x_shift_idx, and
+        # x_pos[w_idx, s_idx] is that cell's position (-1 if no variable)
+        self.x_vars: List[cp_model.IntVar] = []
+        self.x_indptr: np.ndarray = np.zeros(1, dtype=np.int64)
+        self.x_shift_idx: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.x_worker_idx: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.x_pos: np.ndarray = np.zeros((0, 0), dtype=np.int64)
 
-        # Budget tracking variables
-        self.daily_cost_vars: Dict[str, cp_model.IntVar] = {}
+        # Worker indices hardest-to-schedule first, set by create_variables
+        self._worker_priority: List[int] = []
+
+        # Budget tracking variable (also the objective); daily caps are
+        # posted directly on the day's cost terms
         self.total_cost_var: Optional[cp_model.IntVar] = None
 
         # Fairness tracking variables
         self.worker_shift_counts: Dict[str, cp_model.IntVar] = {}
+        self.day_worked: Dict[Tuple[int, int], cp_model.IntVar] = {}
+
+        # Integer-scaled shift/worker arrays built by create_variables,
+        # indexed by data.shift_idx / data.worker_idx
+        self.shift_hours_scaled: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.shift_day_idx: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.shift_start_min: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.shift_end_min: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.max_hours_scaled: np.ndarray = np.zeros(0, dtype=np.int64)
+        self.cost_scaled: np.ndarray = np.zeros((0, 0), dtype=np.int64)
+
+        # Shift index pairs one worker may not hold together, found by
+        # comparing only same-day (overlap) and same/next-day (rest) shifts
+        self._shifts_by_day: Tuple[np.ndarray, ...] = ()
+        self._overlap_pairs: np.ndarray = np.zeros((0, 2), dtype=np.int64)
+        self._rest_pairs: np.ndarray = np.zeros((0, 2), dtype=np.int64)
+
+        # Linear terms gathered by _materialize_terms in one sweep over x
+        self._coverage_terms: List[List[List[cp_model.IntVar]]] = []
+        self._hours_terms: Dict[str, List[Any]] = {}
+        self._day_cost_terms: List[List[Any]] = []
+        self._cost_terms: List[Any] = []
+        self._worker_day_vars: List[List[List[cp_model.IntVar]]] = []
+
+        # Staffed requirements no worker is eligible for, so no coverage
+        # constraint could be posted (None until coverage is added)
+        self._uncoverable_requirements: Optional[int] = None
 
         # Solution storage
         self.solution: Optional[Dict[str, Any]] = None
+        self.status = cp_model.UNKNOWN
         self.solve_time: float = 0.0
         self.optimal_cost: float = 0.0
 
         # Constants
         self.COST_SCALE = 100  # Scale for integer arithmetic
 
+        # Give model variables readable names (debugging only - costs one
+        # string format per variable)
+        self.debug_names: bool = False
+
     def create_variables(self):
         """
         Create decision variables with advanced First Fit Decreasing heuristic.
@@ -310,7 +751,7 @@ class RestaurantSchedulerModel:
         2. Limited availability → harder to place
         3. Higher hourly rate → more impactful on cost
         """
-        print("Creating decision variables with enhanced First Fit Decreasing...")
+        log.info("Creating decision variables with enhanced First Fit Decreasing...")
 
         # Enhanced scoring: difficulty to schedule
         worker_scores = []
@@ -327,19 +768,36 @@ class RestaurantSchedulerModel:
         # Sort by difficulty (descending) - schedule hardest first
         sorted_workers = [w for w, _ in sorted(worker_scores, key=lambda x: -x[1])]
 
-        print(f"  Worker priority order established (hardest → easiest)")
+        log.info("  Worker priority order established (hardest → easiest)")
+
+        # One availability matrix build, then variables only for its True
+        # cells, laid out row-major by worker_idx
+        self.data.finalize()
+        self._worker_priority = [self.data.worker_idx[w] for w in sorted_workers]
+        shift_ids = [shift.shift_id for shift in self.data.shifts]
+
+        can_work = self.data.can_work
+        self.x_indptr = np.concatenate([[0], np.cumsum(can_work.sum(axis=1))])
+        self.x_worker_idx, self.x_shift_idx = np.nonzero(can_work)
+        self.x_pos = np.full(can_work.shape, -1, dtype=np.int64)
+        self.x_pos[can_work] = np.arange(len(self.x_shift_idx))
+        self.x_vars = [None] * len(self.x_shift_idx)
 
+        # Variables are still created hardest worker first
         var_count = 0
         for worker_id in sorted_workers:
-            self.x[worker_id] = {}
+            w_idx = self.data.worker_idx[worker_id]
+            lo = self.x_indptr[w_idx]
 
-            for shift in self.data.shifts:
-                if self.data.worker_can_work_shift(worker_id, shift):
-                    var_name = f"x_{worker_id}_{shift.shift_id}"
-                    self.x[worker_id][shift.shift_id] = self.model.NewBoolVar(var_name)
-                    var_count += 1
+            for k, j in enumerate(self.x_shift_idx[lo:self.x_indptr[w_idx + 1]].tolist()):
+                self.x_vars[lo + k] = self.model.NewBoolVar(self._var_name("x", worker_id, shift_ids[j]))
+                var_count += 1
 
-        print(f"  Created {var_count} decision variables ({len(sorted_workers)} workers × avg {var_count/len(sorted_workers):.1f} shifts)")
+        log.info("  Created %d decision variables (%d workers × avg %.1f shifts)", var_count, len(sorted_workers), var_count/len(sorted_workers))
+
+        self._build_shift_arrays()
+        self._build_conflict_pairs()
+        self._materialize_terms()
 
         # Create auxiliary variables for budget tracking
         self._create_budget_variables()
@@ -347,18 +805,114 @@ class RestaurantSchedulerModel:
         # Create auxiliary variables for fairness tracking
         self._create_fairness_variables()
 
+    def _var_name(self, *parts: Any) -> str:
+        """Name a model variable from its parts, or leave it unnamed unless debug_names is set."""
+        return "_".join(map(str, parts)) if self.debug_names else ""
+
+    def _build_shift_arrays(self):
+        """
+        Precompute the per-shift and per-cell numbers every constraint
+        builder needs as integer arrays, so the builders index arrays
+        instead of re-reading RestaurantShift attributes per variable.
+        """
+        # From integer minutes, so no float round-off in the scaled hours
+        self.shift_hours_scaled = self.data.shift_minutes_arr * self.COST_SCALE // 60
+        self.shift_day_idx = self.data.shift_day_arr
+        self.shift_start_min = np.fromiter((s.start_min for s in self.data.shifts), dtype=np.int64, count=len(self.data.shifts))
+        self.shift_end_min = np.fromiter((s.end_min_wrapped for s in self.data.shifts), dtype=np.int64, count=len(self.data.shifts))
+
+        self.max_hours_scaled = (self.data.max_hours_arr * self.COST_SCALE).astype(np.int64)
+
+        # Same rounding as int(hourly_rate * duration_hours * COST_SCALE)
+        self.cost_scaled = (self.data.labor_cost_arr[:, None] * self.data.shift_duration_arr[None, :] *
+                            self.COST_SCALE).astype(np.int64)
+
+    def _build_conflict_pairs(self):
+        """
+        Bucket shifts by day and look up the overlapping and
+        insufficient-rest shift pairs.
+
+        The tables depend only on shift times and the minimum rest, so they
+        come from a module-level cache shared by every model built over the
+        same shifts (e.g. re-solves with a different budget).
+        """
+        shift_times = tuple(zip(self.shift_day_idx.tolist(), self.shift_start_min.tolist(),
+                                self.shift_end_min.tolist()))
+        self._shifts_by_day, self._overlap_pairs, self._rest_pairs = _conflict_pair_tables(
+            shift_times, len(self.data.days_order), self.data.fairness_constraints.min_rest_hours
+        )
+
+    def _iter_worker_vars(self, w_idx: int) -> Iterator[Tuple[int, cp_model.IntVar]]:
+        """Yield (shift_idx, var) for every decision variable of one worker."""
+        lo, hi = self.x_indptr[w_idx], self.x_indptr[w_idx + 1]
+        return zip(self.x_shift_idx[lo:hi].tolist(), self.x_vars[lo:hi])
+
+    def _materialize_terms(self):
+        """
+        Walk every decision variable once and collect the terms of the
+        coverage, hours, daily cost and total cost sums, plus each
+        worker's variables bucketed by day, so the constraint builders
+        and the objective only post prebuilt lists.
+        """
+        requirements = [self.data.shift_requirements[shift.shift_id] for shift in self.data.shifts]
+
+        self._coverage_terms = [[[] for _ in reqs] for reqs in requirements]
+        self._hours_terms = {}
+        self._day_cost_terms = [[] for _ in self.data.days_order]
+        self._cost_terms = []
+        self._worker_day_vars = []
+
+        # Coverage: per requirement, the positions of the eligible workers'
+        # variables on that shift, found as array masks over x_pos
+        for j, reqs in enumerate(requirements):
+            column = self.x_pos[:, j]
+            eligible = self.data.requirement_eligibility(reqs) & (column >= 0)[:, None]
+            for r, terms in enumerate(self._coverage_terms[j]):
+                terms.extend(self.x_vars[pos] for pos in column[eligible[:, r]].tolist())
+
+        for w_idx, worker_id in enumerate(self.data.workers):
+            worker_costs = self.cost_scaled[w_idx]
+            hours_terms = self._hours_terms[worker_id] = []
+            day_vars = [[] for _ in self.data.days_order]
+            self._worker_day_vars.append(day_vars)
+
+            for j, var in self._iter_worker_vars(w_idx):
+                day_vars[self.shift_day_idx[j]].append(var)
+                hours_terms.append(var * int(self.shift_hours_scaled[j]))
+
+                cost_term = var * int(worker_costs[j])
+                self._day_cost_terms[self.shift_day_idx[j]].append(cost_term)
+                self._cost_terms.append(cost_term)
+
+    def _add_pair_constraints(self, pairs: np.ndarray) -> int:
+        """
+        Forbid every worker holding both shift variables from taking both.
+
+        Posted as the clause (not x[w][a] or not x[w][b]), which CP-SAT
+        propagates with watched literals instead of a linear constraint.
+        """
+        # (worker, pair) cells where the worker has a variable for both shifts
+        pos_a = self.x_pos[:, pairs[:, 0]]
+        pos_b = self.x_pos[:, pairs[:, 1]]
+        both = (pos_a >= 0) & (pos_b >= 0)
+
+        for var_a, var_b in zip(pos_a[both].tolist(), pos_b[both].tolist()):
+            self.model.AddBoolOr([self.x_vars[var_a].Not(), self.x_vars[var_b].Not()])
+
+        return int(both.sum())
+
     def _create_budget_variables(self):
-        """Create auxiliary variables for budget constraint tracking."""
+        """
+        Create the total cost variable (also the objective). Under a
+        budget its domain carries the total cap.
+        """
         if not self.data.budget_constraint:
+            # No cap - bound by the cost of taking every available assignment
+            max_total_cents = int(self.cost_scaled[self.data.can_work].sum())
+            self.total_cost_var = self.model.NewIntVar(0, max_total_cents, "total_cost")
             return
 
-        print("  Creating budget tracking variables...")
-
-        # Create variables for daily costs if daily budget constraint exists
-        if self.data.budget_constraint.max_daily_cost:
-            for day in self.data.days_order:
-                max_cost_cents = int(self.data.budget_constraint.max_daily_cost * self.COST_SCALE)
-                self.daily_cost_vars[day] = self.model.NewIntVar(0, max_cost_cents, f"daily_cost_{day}")
+        log.info("  Creating budget tracking variables...")
 
         # Create variable for total cost
         max_total_cents = int(self.data.budget_constraint.max_total_cost * self.COST_SCALE)
@@ -366,13 +920,13 @@ class RestaurantSchedulerModel:
 
     def _create_fairness_variables(self):
         """Create auxiliary variables for fairness constraint tracking."""
-        print("  Creating fairness tracking variables...")
+        log.info("  Creating fairness tracking variables...")
 
         # Create variables to count shifts per worker
         max_possible_shifts = len(self.data.shifts)
         for worker_id in self.data.workers:
             self.worker_shift_counts[worker_id] = self.model.NewIntVar(
-                0, max_possible_shifts, f"shift_count_{worker_id}"
+                0, max_possible_shifts, self._var_name("shift_count", worker_id)
             )
 
     def add_hard_constraints(self):
@@ -389,7 +943,7 @@ class RestaurantSchedulerModel:
         7. Consecutive days limit
         8. Minimum rest between shifts
         """
-        print("Adding hard constraints...")
+        log.info("Adding hard constraints...")
 
         # Standard constraints (1-5)
         self._add_coverage_constraints()
@@ -397,8 +951,7 @@ class RestaurantSchedulerModel:
         self._add_hours_constraints()
 
         # NEW: Budget constraints (6)
-        if self.data.budget_constraint:
-            self._add_budget_constraints()
+        self._add_budget_constraints()
 
         # NEW: Fairness hard constraints (7-8)
         self._add_consecutive_days_constraints()
@@ -406,121 +959,63 @@ class RestaurantSchedulerModel:
 
     def _add_coverage_constraints(self):
         """Ensure all shifts are fully staffed."""
-        print("  [1/8] Adding shift coverage constraints...")
+        log.info("  [1/8] Adding shift coverage constraints...")
         count = 0
+        self._uncoverable_requirements = 0
 
-        for shift in self.data.shifts:
+        for j, shift in enumerate(self.data.shifts):
             requirements = self.data.shift_requirements[shift.shift_id]
 
-            for req in requirements:
-                eligible_workers = []
-
-                for worker_id in self.data.workers:
-                    if shift.shift_id not in self.x.get(worker_id, {}):
-                        continue
-
-                    has_role = self.data.worker_has_skill(worker_id, req.role)
-                    has_skill = self.data.worker_has_skill(worker_id, req.required_skill)
-
-                    if has_role and has_skill:
-                        eligible_workers.append(worker_id)
+            for req, eligible_vars in zip(requirements, self._coverage_terms[j]):
+                if not eligible_vars:
+                    if req.count > 0:
+                        self._uncoverable_requirements += 1
+                    continue
 
-                if eligible_workers:
-                    self.model.Add(
-                        sum(self.x[w][shift.shift_id] for w in eligible_workers) == req.count
-                    )
-                    count += 1
+                # Single-person requirements use the dedicated Boolean constraint
+                if req.count == 1:
+                    self.model.AddExactlyOne(eligible_vars)
+                else:
+                    self.model.Add(sum(eligible_vars) == req.count)
+                count += 1
 
-        print(f"    Added {count} coverage constraints")
+        log.info("    Added %d coverage constraints", count)
 
     def _add_overlap_constraints(self):
         """Prevent workers from being assigned to overlapping shifts."""
-        print("  [2/8] Adding no-overlap constraints...")
-        count = 0
-
-        # Pre-compute all overlapping shift pairs (memoization)
-        if not hasattr(self, '_overlap_cache'):
-            self._overlap_cache = {}
-            shift_list = self.data.shifts
-
-            for i, shift_1 in enumerate(shift_list):
-                for shift_2 in shift_list[i+1:]:
-                    if self._shifts_overlap(shift_1, shift_2):
-                        pair = tuple(sorted([shift_1.shift_id, shift_2.shift_id]))
-                        self._overlap_cache[pair] = True
-
-        # Now use cache for O(n) instead of O(n³)
-        for worker_id in self.data.workers:
-            if worker_id not in self.x:
-                continue
-
-            assigned_shifts = list(self.x[worker_id].keys())
-
-            for i, shift_id_1 in enumerate(assigned_shifts):
-                for shift_id_2 in assigned_shifts[i+1:]:
-                    pair = tuple(sorted([shift_id_1, shift_id_2]))
-
-                    if pair in self._overlap_cache:
-                        self.model.Add(
-                            self.x[worker_id][shift_id_1] + self.x[worker_id][shift_id_2] <= 1
-                        )
-                        count += 1
-
-        print(f"    Added {count} overlap prevention constraints")
+        log.info("  [2/8] Adding no-overlap constraints...")
+        count = self._add_pair_constraints(self._overlap_pairs)
+        log.info("    Added %d overlap prevention constraints", count)
 
     def _add_hours_constraints(self):
         """Enforce maximum weekly hours per worker."""
-        print("  [3/8] Adding maximum hours constraints...")
+        log.info("  [3/8] Adding maximum hours constraints...")
         count = 0
 
-        for worker_id in self.data.workers:
-            if worker_id not in self.x:
-                continue
-
-            max_hours = self.data.max_hours_per_week.get(worker_id, 40.0)
-
-            total_hours_scaled = []
-            for shift_id in self.x[worker_id]:
-                shift = self.data.get_shift(shift_id)
-                hours_scaled = int(shift.duration_hours * self.COST_SCALE)
-                total_hours_scaled.append(self.x[worker_id][shift_id] * hours_scaled)
-
+        # _hours_terms is keyed in data.workers order, like max_hours_scaled
+        for max_hours_scaled, total_hours_scaled in zip(self.max_hours_scaled.tolist(), self._hours_terms.values()):
             if total_hours_scaled:
-                max_hours_scaled = int(max_hours * self.COST_SCALE)
                 self.model.Add(sum(total_hours_scaled) <= max_hours_scaled)
                 count += 1
 
-        print(f"    Added {count} maximum hours constraints")
+        log.info("    Added %d maximum hours constraints", count)
 
     def _add_budget_constraints(self):
         """NEW: Add budget constraints (critical for restaurants)."""
-        print("  [4/8] Adding budget constraints...")
+        # Tie the total cost variable to the assignments; the objective
+        # minimizes this same variable
+        if self._cost_terms:
+            self.model.Add(sum(self._cost_terms) == self.total_cost_var)
 
         if not self.data.budget_constraint:
             return
 
-        # Calculate total cost across all assignments
-        total_cost_terms = []
-
-        for worker_id in self.data.workers:
-            if worker_id not in self.x:
-                continue
-
-            hourly_rate = self.data.labor_cost[worker_id]
+        log.info("  [4/8] Adding budget constraints...")
 
-            for shift_id in self.x[worker_id]:
-                shift = self.data.get_shift(shift_id)
-                shift_cost = int(hourly_rate * shift.duration_hours * self.COST_SCALE)
-                total_cost_terms.append(self.x[worker_id][shift_id] * shift_cost)
-
-        # Constraint: Total cost must not exceed budget
-        if total_cost_terms and self.total_cost_var:
-            self.model.Add(sum(total_cost_terms) == self.total_cost_var)
-
-            max_cost_scaled = int(self.data.budget_constraint.max_total_cost * self.COST_SCALE)
-            self.model.Add(self.total_cost_var <= max_cost_scaled)
-
-            print(f"    Added budget cap: ${self.data.budget_constraint.max_total_cost:.2f}")
+        # Constraint: Total cost must not exceed budget - the cap is the
+        # upper bound of total_cost_var, so no separate inequality
+        if self._cost_terms:
+            log.info("    Added budget cap: $%.2f", self.data.budget_constraint.max_total_cost)
 
         # Optional: Daily budget constraints
         if self.data.budget_constraint.max_daily_cost:
@@ -528,89 +1023,60 @@ class RestaurantSchedulerModel:
 
     def _add_daily_budget_constraints(self):
         """Add per-day budget constraints."""
-        for day in self.data.days_order:
-            day_cost_terms = []
+        # Nothing reads a day's total, so cap the sum directly rather than
+        # through an auxiliary variable and an equality
+        max_daily_scaled = int(self.data.budget_constraint.max_daily_cost * self.COST_SCALE)
+        for day_cost_terms in self._day_cost_terms:
+            if day_cost_terms:
+                self.model.Add(sum(day_cost_terms) <= max_daily_scaled)
 
-            for worker_id in self.data.workers:
-                if worker_id not in self.x:
-                    continue
-
-                hourly_rate = self.data.labor_cost[worker_id]
-
-                for shift_id in self.x[worker_id]:
-                    shift = self.data.get_shift(shift_id)
-                    if shift.day == day:
-                        shift_cost = int(hourly_rate * shift.duration_hours * self.COST_SCALE)
-                        day_cost_terms.append(self.x[worker_id][shift_id] * shift_cost)
-
-            if day_cost_terms and day in self.daily_cost_vars:
-                self.model.Add(sum(day_cost_terms) == self.daily_cost_vars[day])
-
-                max_daily_scaled = int(self.data.budget_constraint.max_daily_cost * self.COST_SCALE)
-                self.model.Add(self.daily_cost_vars[day] <= max_daily_scaled)
-
-        print(f"    Added daily budget cap: ${self.data.budget_constraint.max_daily_cost:.2f}/day")
+        log.info("    Added daily budget cap: $%.2f/day", self.data.budget_constraint.max_daily_cost)
 
     def _add_consecutive_days_constraints(self):
         """NEW: Limit consecutive working days."""
-        print("  [5/8] Adding consecutive days constraints...")
+        log.info("  [5/8] Adding consecutive days constraints...")
 
         max_consecutive = self.data.fairness_constraints.max_consecutive_days
         if max_consecutive >= 7:
-            print("    Skipped (max >= 7 days)")
+            log.info("    Skipped (max >= 7 days)")
             return
 
+        n_days = len(self.data.days_order)
         count = 0
-        for worker_id in self.data.workers:
-            if worker_id not in self.x:
-                continue
+        for w_idx, worker_id in enumerate(self.data.workers):
+            # day_worked[w, d] is true iff any shift on day d is taken; a lone
+            # shift variable already is that indicator
+            for day_idx, bucket in enumerate(self._worker_day_vars[w_idx]):
+                if len(bucket) == 1:
+                    self.day_worked[w_idx, day_idx] = bucket[0]
+                elif bucket:
+                    worked = self.model.NewBoolVar(self._var_name("worked", worker_id, day_idx))
+                    self.model.AddMaxEquality(worked, bucket)
+                    self.day_worked[w_idx, day_idx] = worked
 
             # For each possible window of (max_consecutive + 1) days
-            for start_idx in range(len(self.data.days_order) - max_consecutive):
-                window_days = self.data.days_order[start_idx:start_idx + max_consecutive + 1]
-
-                # Collect all shifts in this window for this worker
-                window_shift_vars = []
-                for day in window_days:
-                    for shift_id in self.x[worker_id]:
-                        shift = self.data.get_shift(shift_id)
-                        if shift.day == day:
-                            window_shift_vars.append(self.x[worker_id][shift_id])
+            for start_idx in range(n_days - max_consecutive):
+                window_days = [
+                    self.day_worked[w_idx, d]
+                    for d in range(start_idx, start_idx + max_consecutive + 1)
+                    if (w_idx, d) in self.day_worked
+                ]
 
                 # At least one day off in this window
-                if window_shift_vars:
-                    self.model.Add(sum(window_shift_vars) <= max_consecutive)
+                if len(window_days) > max_consecutive:
+                    self.model.Add(sum(window_days) <= max_consecutive)
                     count += 1
 
-        print(f"    Added {count} consecutive days limits (max: {max_consecutive})")
+        log.info("    Added %d consecutive days limits (max: %s)", count, max_consecutive)
 
     def _add_rest_period_constraints(self):
         """NEW: Ensure minimum rest hours between shifts."""
-        print("  [6/8] Adding rest period constraints...")
+        log.info("  [6/8] Adding rest period constraints...")
 
         min_rest = self.data.fairness_constraints.min_rest_hours
-        count = 0
+        count = self._add_pair_constraints(self._rest_pairs)
 
-        for worker_id in self.data.workers:
-            if worker_id not in self.x:
-                continue
-
-            assigned_shifts = list(self.x[worker_id].keys())
-
-            for i, shift_id_1 in enumerate(assigned_shifts):
-                shift_1 = self.data.get_shift(shift_id_1)
-
-                for shift_id_2 in assigned_shifts[i+1:]:
-                    shift_2 = self.data.get_shift(shift_id_2)
-
-                    # Check if shifts are too close together
-                    if self._insufficient_rest(shift_1, shift_2, min_rest):
-                        self.model.Add(
-                            self.x[worker_id][shift_id_1] + self.x[worker_id][shift_id_2] <= 1
-                        )
-                        count += 1
-
-        print(f"    Added {count} rest period constraints (min: {min_rest}h)")
+        log.info("    Added %d rest period constraints (min: %sh)", count, min_rest)
 
     def add_soft_constraints_to_objective(self):
         """
@@ -621,18 +1087,15 @@ class RestaurantSchedulerModel:
         - Balance shift distribution across workers
         - Minimize shift count variance
         """
-        print("  [7/8] Adding soft constraint penalties...")
+        log.info("  [7/8] Adding soft constraint penalties...")
 
         # Link worker shift counts to actual assignments
-        for worker_id in self.data.workers:
-            if worker_id not in self.x:
-                continue
-
-            shift_vars = [self.x[worker_id][sid] for sid in self.x[worker_id]]
+        for w_idx, worker_id in enumerate(self.data.workers):
+            shift_vars = self.x_vars[self.x_indptr[w_idx]:self.x_indptr[w_idx + 1]]
             if shift_vars:
                 self.model.Add(self.worker_shift_counts[worker_id] == sum(shift_vars))
 
-        print("    Soft constraints will be handled in objective function")
+        log.info("    Soft constraints will be handled in objective function")
 
     def define_objective(self):
         """
@@ -641,21 +1104,11 @@ class RestaurantSchedulerModel:
         2. SECONDARY: Balance fairness (minimize shift variance)
         3. TERTIARY: Approach target cost (if specified)
         """
-        print("  [8/8] Defining objective function...")
-
-        objective_terms = []
-
-        # PRIMARY: Minimize labor cost
-        for worker_id in self.data.workers:
-            if worker_id not in self.x:
-                continue
-
-            hourly_rate = self.data.labor_cost[worker_id]
+        log.info("  [8/8] Defining objective function...")
 
-            for shift_id in self.x[worker_id]:
-                shift = self.data.get_shift(shift_id)
-                shift_cost = int(hourly_rate * shift.duration_hours * self.COST_SCALE)
-                objective_terms.append(self.x[worker_id][shift_id] * shift_cost)
+        # PRIMARY: Minimize labor cost (total_cost_var is linked to the
+        # per-assignment cost terms in _add_budget_constraints)
+        objective_terms = self._cost_terms
 
         # SECONDARY: Fairness penalty (optional, weighted lower)
         if self.data.fairness_constraints.prefer_even_distribution:
@@ -664,10 +1117,11 @@ class RestaurantSchedulerModel:
             pass  # Keeping simple for now
 
         if objective_terms:
-            self.model.Minimize(sum(objective_terms))
-            print(f"    Objective defined with {len(objective_terms)} cost terms")
+            self.model.Minimize(self.total_cost_var)
+            log.info("    Objective defined with %d cost terms", len(objective_terms))
 
-    def solve_model(self, time_limit_seconds: int = 60) -> bool:
+    def solve_model(self, time_limit_seconds: int = 60, num_workers: Optional[int] = None,
+                    refine_iterations: int = 100) -> bool:
         """
         Solve the scheduling problem using CP-SAT with comprehensive error handling.
 
@@ -675,90 +1129,107 @@ class RestaurantSchedulerModel:
         from OptaPlanner by:
         1. Using CP-SAT's built-in search strategies (similar to First Fit)
         2. Allowing time for the solver to refine the solution (like Tabu Search)
+        3. Polishing a merely FEASIBLE result with a short Tabu Search pass
+
+        The time limit covers both phases: when refinement is enabled, a
+        tenth of it is held back from CP-SAT for the Tabu pass.
 
         Args:
-            time_limit_seconds: Maximum solving time (default: 60s)
+            time_limit_seconds: Maximum solving time for CP-SAT and Tabu
+                                refinement together (default: 60s)
+            num_workers: Parallel CP-SAT search workers (default: config.num_workers)
+            refine_iterations: Tabu steps per walk after a FEASIBLE result (0 disables)
 
         Returns:
             bool: True if solution found, False otherwise
         """
         try:
-            print("\n" + "=" * 80)
-            print("SOLVING RESTAURANT SCHEDULE (OptaPlanner-inspired approach)")
-            print("=" * 80)
+            log.info("\n" + "=" * 80)
+            log.info("SOLVING RESTAURANT SCHEDULE (OptaPlanner-inspired approach)")
+            log.info("=" * 80)
 
             # Validate time limit
             if time_limit_seconds < 1 or time_limit_seconds > 600:
-                print(f"⚠️  Warning: Time limit {time_limit_seconds}s outside recommended range (1-600s)")
+                log.warning("⚠️  Warning: Time limit %ss outside recommended range (1-600s)", time_limit_seconds)
                 time_limit_seconds = max(1, min(600, time_limit_seconds))
 
+            # Hold part of the budget back for Tabu refinement so the
+            # caller's limit covers both phases
+            refine_time = 0.1 * time_limit_seconds if refine_iterations > 0 else 0.0
+            cp_time_limit = time_limit_seconds - refine_time
+
             # Configure solver for metaheuristic-like behavior
-            self.solver.parameters.max_time_in_seconds = time_limit_seconds
-            self.solver.parameters.log_search_progress = False
+            self.config.apply(self.solver)
+            self.solver.parameters.max_time_in_seconds = cp_time_limit
 
             # Enable parallel search for better performance
-            self.solver.parameters.num_search_workers = 4
+            if num_workers is None:
+                num_workers = self.config.num_workers
+            self.solver.parameters.num_workers = num_workers
+
+            log.info("Phase 1: Construction heuristic (CP-SAT search)")
+            log.info("Phase 2: Local search refinement (up to %ss)", cp_time_limit)
+            log.info("Parallel workers: %s", num_workers)
 
-            print(f"Phase 1: Construction heuristic (CP-SAT search)")
-            print(f"Phase 2: Local search refinement (up to {time_limit_seconds}s)")
-            print(f"Parallel workers: 4")
-            print()
+            # Warm start from a First Fit Decreasing schedule
+            self._add_ffd_hint()
 
-            import time
             start_time = time.time()
 
             # Solve with timeout protection
             try:
                 status = self.solver.Solve(self.model)
             except Exception as solver_error:
-                print(f"✗ Solver error: {solver_error}")
-                print("Attempting recovery with relaxed constraints...")
+                log.warning("✗ Solver error: %s", solver_error)
+                log.info("Attempting recovery with relaxed constraints...")
 
                 # Try with more time and single worker
-                self.solver.parameters.num_search_workers = 1
+                self.solver.parameters.num_workers = 1
                 self.solver.parameters.max_time_in_seconds = min(time_limit_seconds * 2, 300)
                 status = self.solver.Solve(self.model)
 
             self.solve_time = time.time() - start_time
+            self.status = status
 
-            print(f"Solve time: {self.solve_time:.2f} seconds")
-            print(f"Status: {self.solver.StatusName(status)}")
+            log.info("Solve time: %.2f seconds", self.solve_time)
+            log.info("Status: %s", self.solver.StatusName(status))
 
             if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
                 self._extract_solution()
 
                 # Provide quality indicator
                 if status == cp_model.OPTIMAL:
-                    print("✓ OPTIMAL solution found!")
+                    log.info("✓ OPTIMAL solution found!")
                 else:
-                    print("✓ FEASIBLE solution found (may not be optimal)")
+                    log.info("✓ FEASIBLE solution found (may not be optimal)")
+                    if refine_iterations > 0:
+                        self._tabu_refine(time_limit=refine_time, max_iterations=refine_iterations,
+                                          n_walkers=min(num_workers, self.config.num_workers))
 
                 return True
             elif status == cp_model.INFEASIBLE:
-                print("✗ INFEASIBLE - No valid schedule exists")
+                log.warning("✗ INFEASIBLE - No valid schedule exists")
                 self._diagnose_infeasibility()
                 return False
             else:
-                print(f"✗ Solver status: {self.solver.StatusName(status)}")
+                log.warning("✗ Solver status: %s", self.solver.StatusName(status))
                 return False
 
         except MemoryError:
-            print("✗ OUT OF MEMORY - Problem too large")
-            print("Suggestions:")
-            print("  1. Reduce number of shifts")
-            print("  2. Reduce number of workers")
-            print("  3. Simplify constraints")
+            log.warning("✗ OUT OF MEMORY - Problem too large")
+            log.info("Suggestions:")
+            log.info("  1. Reduce number of shifts")
+            log.info("  2. Reduce number of workers")
+            log.info("  3. Simplify constraints")
             return False
         except Exception as e:
-            print(f"✗ Unexpected error during solving: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("✗ Unexpected error during solving: %s", e)
             return False
 
     def _diagnose_infeasibility(self):
         """Provide diagnostic information when problem is infeasible."""
-        print("\n🔍 INFEASIBILITY DIAGNOSIS:")
-        print("-" * 80)
+        log.info("\n🔍 INFEASIBILITY DIAGNOSIS:")
+        log.info("-" * 80)
 
         # Check common causes
         total_required_hours = sum(
@@ -771,11 +1242,11 @@ class RestaurantSchedulerModel:
             for worker_id in self.data.workers
         )
 
-        print(f"Required hours: {total_required_hours:.1f}")
-        print(f"Available hours: {total_available_hours:.1f}")
+        log.info("Required hours: %.1f", total_required_hours)
+        log.info("Available hours: %.1f", total_available_hours)
 
         if total_required_hours > total_available_hours:
-            print("❌ NOT ENOUGH TOTAL HOURS - Add more workers or increase max hours")
+            log.warning("❌ NOT ENOUGH TOTAL HOURS - Add more workers or increase max hours")
 
         # Check budget feasibility
         if self.data.budget_constraint:
@@ -785,104 +1256,264 @@ class RestaurantSchedulerModel:
                 for shift in self.data.shifts
             )
 
-            print(f"\nBudget cap: ${self.data.budget_constraint.max_total_cost:.2f}")
-            print(f"Minimum possible cost: ${min_possible_cost:.2f}")
+            log.info("\nBudget cap: $%.2f", self.data.budget_constraint.max_total_cost)
+            log.info("Minimum possible cost: $%.2f", min_possible_cost)
 
             if min_possible_cost > self.data.budget_constraint.max_total_cost:
-                print("❌ BUDGET TOO TIGHT - Even cheapest workers exceed budget")
-                print(f"   Increase budget to at least ${min_possible_cost:.2f}")
+                log.warning("❌ BUDGET TOO TIGHT - Even cheapest workers exceed budget")
+                log.info("   Increase budget to at least $%.2f", min_possible_cost)
 
-        print("\nTry:")
-        print("  1. Increase weekly budget")
-        print("  2. Add more workers")
-        print("  3. Reduce shift requirements")
-        print("  4. Relax fairness constraints")
+        log.info("\nTry:")
+        log.info("  1. Increase weekly budget")
+        log.info("  2. Add more workers")
+        log.info("  3. Reduce shift requirements")
+        log.info("  4. Relax fairness constraints")
 
-    def _extract_solution(self):
-        """Extract solution from solver."""
-        self.optimal_cost = self.solver.ObjectiveValue() / self.COST_SCALE
+    def solve_hybrid(self, cp_time_budget: float = 5.0, tabu_time_budget: float = 55.0,
+                     n_walkers: Optional[int] = None) -> bool:
+        """
+        Two-phase solve: a short CP-SAT run for a feasible schedule, then
+        Tabu Search refinement warm-started from it.
 
-        assignments = []
-        worker_hours = {w: 0.0 for w in self.data.workers}
-        shift_assignments = {s.shift_id: [] for s in self.data.shifts}
+        CP-SAT settles feasibility (or proves infeasibility) quickly; the rest
+        of the time budget goes to multi-walk Tabu Search, which improves cost
+        per second faster than prolonging the exact search on large instances.
+        A schedule CP-SAT already proved optimal is returned unchanged.
 
-        for worker_id in self.data.workers:
-            if worker_id not in self.x:
-                continue
+        Args:
+            cp_time_budget: Seconds for the CP-SAT phase
+            tabu_time_budget: Seconds per Tabu walk
+            n_walkers: Parallel Tabu walks (default: CPU count)
 
-            for shift_id in self.x[worker_id]:
-                if self.solver.Value(self.x[worker_id][shift_id]) == 1:
-                    shift = self.data.get_shift(shift_id)
-                    cost = self.data.labor_cost[worker_id] * shift.duration_hours
+        Returns:
+            bool: True if solution found, False otherwise
+        """
+        if not self.solve_model(time_limit_seconds=cp_time_budget, refine_iterations=0):
+            return False
 
-                    assignments.append({
-                        'worker_id': worker_id,
-                        'shift_id': shift_id,
-                        'shift': shift,
-                        'cost': cost
-                    })
+        if self.status == cp_model.OPTIMAL or tabu_time_budget <= 0:
+            return True
 
-                    worker_hours[worker_id] += shift.duration_hours
-                    shift_assignments[shift_id].append(worker_id)
+        self._tabu_refine(time_limit=tabu_time_budget, n_walkers=n_walkers)
+        return True
 
-        self.solution = {
-            'assignments': assignments,
-            'worker_hours': worker_hours,
-            'shift_assignments': shift_assignments,
-            'total_cost': self.optimal_cost,
-            'solve_time': self.solve_time
-        }
+    def _tabu_refine(self, time_limit: float, max_iterations: int = 10000,
+                     n_walkers: Optional[int] = None) -> bool:
+        """
+        Run multi-walk Tabu Search from the current solver assignment and
+        adopt the result if it is cheaper.
 
-    def _shifts_overlap(self, shift1: RestaurantShift, shift2: RestaurantShift) -> bool:
-        """Check if two shifts overlap."""
-        if shift1.day != shift2.day:
-            return False
+        Args:
+            time_limit: Seconds per Tabu walk
+            max_iterations: Upper bound on steps per walk
+            n_walkers: Parallel Tabu walks (default: CPU count)
 
-        start1 = datetime.strptime(shift1.start_time, "%H:%M")
-        end1 = datetime.strptime(shift1.end_time, "%H:%M")
-        start2 = datetime.strptime(shift2.start_time, "%H:%M")
-        end2 = datetime.strptime(shift2.end_time, "%H:%M")
+        Returns:
+            bool: True if the solution was improved
+        """
+        log.info("Phase 3: Tabu Search refinement (up to %.0fs)", time_limit)
+        start_time = time.time()
 
-        if end1 < start1:
-            end1 += timedelta(days=1)
-        if end2 < start2:
-            end2 += timedelta(days=1)
+        search = TabuSearch(self.data, self._conflict_matrix(), cost_scale=self.COST_SCALE)
+        initial = self._assignment_matrix()
+        initial_cost = int((initial * search.cost).sum())
+        best, best_cost = parallel_solve(search, initial, n_walkers=n_walkers, time_limit=time_limit,
+                                         max_iterations=max_iterations)
 
-        return start1 < end2 and start2 < end1
+        self.solve_time += time.time() - start_time
 
-    def _insufficient_rest(self, shift1: RestaurantShift, shift2: RestaurantShift, min_rest_hours: float) -> bool:
-        """Check if there's insufficient rest between two shifts."""
-        day1_idx = self.data.get_day_index(shift1.day)
-        day2_idx = self.data.get_day_index(shift2.day)
+        if best_cost < initial_cost:
+            log.info("✓ Tabu Search improved cost: $%.2f → $%.2f", initial_cost / self.COST_SCALE, best_cost / self.COST_SCALE)
+            self._build_solution(best, best_cost)
+            return True
 
-        # Only check consecutive or same day
-        if abs(day2_idx - day1_idx) > 1:
-            return False
+        log.info("Tabu Search found no cheaper schedule")
+        self.solution['solve_time'] = self.solve_time
+        return False
 
-        end1 = datetime.strptime(shift1.end_time, "%H:%M")
-        start2 = datetime.strptime(shift2.start_time, "%H:%M")
+    def _assignment_matrix(self) -> np.ndarray:
+        """Read the solver's assignment into a (n_workers, n_shifts) uint8 matrix."""
+        assignment = self.data.make_empty_assignment()
 
-        # Handle day transitions
-        if day2_idx > day1_idx:
-            start2 += timedelta(days=1)
+        values = np.fromiter((self.solver.Value(var) for var in self.x_vars), dtype=np.uint8, count=len(self.x_vars))
+        assignment[self.x_worker_idx, self.x_shift_idx] = values
 
-        if end1 < start2:
-            rest_hours = (start2 - end1).total_seconds() / 3600
-            return rest_hours < min_rest_hours
+        return assignment
 
-        return False
+    def _greedy_ffd_assignment(self) -> np.ndarray:
+        """
+        First Fit Decreasing construction heuristic.
+
+        Shifts are filled hardest first (fewest eligible workers); each open
+        seat goes to the cheapest eligible worker, ties broken by worker
+        priority, who still has hours left, no overlap/rest conflict, no
+        consecutive-days violation, and who would not over-fill another
+        requirement of the shift. Seats nobody can take stay open, so the
+        result may be partial - it only seeds the solver.
+
+        Returns:
+            (n_workers, n_shifts) uint8 assignment matrix
+        """
+        data = self.data
+        n_workers, n_shifts = data.can_work.shape
+        assignment = data.make_empty_assignment()
+        conflicts = self._conflict_matrix()
+
+        worker_hours = np.zeros(n_workers, dtype=np.int64)
+        max_hours = self.max_hours_scaled
+        day_masks = np.zeros(n_workers, dtype=np.int64)
+
+        priority_rank = np.empty(n_workers, dtype=np.int64)
+        priority_rank[self._worker_priority] = np.arange(n_workers)
+
+        # (n_workers, n_requirements) eligibility per shift
+        eligibility = []
+        for j, shift in enumerate(data.shifts):
+            eligible = data.requirement_eligibility(data.shift_requirements[shift.shift_id])
+            eligibility.append(eligible & data.can_work[:, j, None])
+
+        for j in sorted(range(n_shifts), key=lambda j: eligibility[j].any(axis=1).sum()):
+            eligible = eligibility[j]
+            needed = np.array([req.count for req in data.shift_requirements[data.shifts[j].shift_id]], dtype=np.int64)
+            have = np.zeros_like(needed)
+            day_bit = 1 << int(self.shift_day_idx[j])
+
+            for r in range(len(needed)):
+                while have[r] < needed[r]:
+                    ok = (eligible[:, r] &
+                          (assignment[:, j] == 0) &
+                          ((have + eligible) <= needed).all(axis=1) &
+                          (worker_hours + self.shift_hours_scaled[j] <= max_hours) &
+                          ~assignment[:, conflicts[j]].any(axis=1) &
+                          data.consecutive_days_ok(day_masks | day_bit))
+
+                    candidates = np.flatnonzero(ok)
+                    if len(candidates) == 0:
+                        break
+
+                    w = candidates[np.lexsort((priority_rank[candidates], self.cost_scaled[candidates, j]))[0]]
+                    assignment[w, j] = 1
+                    worker_hours[w] += self.shift_hours_scaled[j]
+                    day_masks[w] |= day_bit
+                    have += eligible[w]
+
+        return assignment
+
+    def _add_ffd_hint(self):
+        """Hint the First Fit Decreasing schedule to CP-SAT as its starting point."""
+        hint = self._greedy_ffd_assignment()[self.x_worker_idx, self.x_shift_idx]
+
+        self.model.ClearHints()
+        for var, value in zip(self.x_vars, hint.tolist()):
+            self.model.AddHint(var, value)
+
+        # The greedy schedule may leave seats open; let CP-SAT repair it
+        self.solver.parameters.repair_hint = True
+
+    def _conflict_matrix(self) -> np.ndarray:
+        """Shift pairs one worker may not hold together (overlap or too little rest)."""
+        n_shifts = len(self.data.shifts)
+        conflicts = np.zeros((n_shifts, n_shifts), dtype=np.bool_)
+
+        pairs = np.concatenate([self._overlap_pairs, self._rest_pairs])
+        conflicts[pairs[:, 0], pairs[:, 1]] = True
+        conflicts[pairs[:, 1], pairs[:, 0]] = True
+
+        return conflicts
+
+    def _extract_solution(self):
+        """Extract solution from solver."""
+        self._build_solution(self._assignment_matrix(), self.solver.ObjectiveValue())
+
+    def _build_solution(self, assignment: np.ndarray, objective_scaled: float):
+        """Build the solution dictionary from an assignment matrix."""
+        self.optimal_cost = objective_scaled / self.COST_SCALE
+
+        data = self.data
+        n_workers = len(data.workers)
+
+        # Assignments as parallel columns, worker-major like the matrix rows
+        assigned_worker, assigned_shift = np.nonzero(assignment)
+        assigned_hours = data.shift_duration_arr[assigned_shift]
+        assigned_cost = data.labor_cost_arr[assigned_worker] * assigned_hours
+        hours_arr = np.bincount(assigned_worker, weights=assigned_hours, minlength=n_workers)
+        cost_arr = np.bincount(assigned_worker, weights=assigned_cost, minlength=n_workers)
+
+        assignments = [
+            {
+                'worker_id': data.workers[i],
+                'shift_id': data.shifts[j].shift_id,
+                'shift': data.shifts[j],
+                'cost': cost
+            }
+            for i, j, cost in zip(assigned_worker.tolist(), assigned_shift.tolist(), assigned_cost.tolist())
+        ]
+
+        shift_assignments = {s.shift_id: [] for s in data.shifts}
+        for entry in assignments:
+            shift_assignments[entry['shift_id']].append(entry['worker_id'])
+
+        # Per-worker lists in (day, start) order
+        chronological_rank = np.empty(len(data.shifts), dtype=np.int64)
+        chronological_rank[np.lexsort((self.shift_start_min, self.shift_day_idx))] = np.arange(len(data.shifts))
+        worker_assignments = {w: [] for w in data.workers}
+        for pos in np.lexsort((chronological_rank[assigned_shift], assigned_worker)).tolist():
+            worker_assignments[data.workers[assigned_worker[pos]]].append(assignments[pos])
+
+        self.solution = {
+            'assignments': assignments,
+            'worker_hours': dict(zip(data.workers, hours_arr.tolist())),
+            'worker_cost': dict(zip(data.workers, cost_arr.tolist())),
+            'worker_assignments': worker_assignments,
+            'shift_assignments': shift_assignments,
+            # Structure-of-arrays view: per-worker totals indexed like
+            # data.workers, and one entry per assignment in the same order
+            # as 'assignments'
+            'worker_hours_arr': hours_arr,
+            'worker_cost_arr': cost_arr,
+            'assignment_worker_idx': assigned_worker,
+            'assignment_shift_idx': assigned_shift,
+            'assignment_cost': assigned_cost,
+            'total_cost': self.optimal_cost,
+            'solve_time': self.solve_time,
+            # Every requirement got an exact coverage constraint, so a
+            # feasible schedule staffs all of them
+            'all_hard_constraints_satisfied': self._uncoverable_requirements == 0
+        }
+
+    def _shifts_overlap(self, a, b):
+        """
+        Check if shifts a and b overlap.
+
+        a and b are shift indices or equal-length index arrays; returns a
+        bool (array) accordingly.
+        """
+        return shifts_overlap(self.shift_day_idx, self.shift_start_min, self.shift_end_min, a, b)
+
+    def _insufficient_rest(self, a, b, min_rest_hours: float):
+        """
+        Check if there's insufficient rest between shifts a and b.
+
+        a and b are shift indices or equal-length index arrays; returns a
+        bool (array) accordingly.
+        """
+        return insufficient_rest(self.shift_day_idx, self.shift_start_min, self.shift_end_min,
+                                 a, b, min_rest_hours)
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get comprehensive solution statistics."""
         if not self.solution:
             return {}
 
+        hours = self.solution['worker_hours_arr']
+        worked = hours[hours > 0]
+
         stats = {
             'total_cost': self.solution['total_cost'],
             'solve_time': self.solution['solve_time'],
             'num_assignments': len(self.solution['assignments']),
-            'num_workers_used': sum(1 for h in self.solution['worker_hours'].values() if h > 0),
-            'avg_hours_per_worker': sum(self.solution['worker_hours'].values()) / len(self.data.workers),
+            'num_workers_used': int(worked.size),
+            'avg_hours_per_worker': float(hours.sum()) / len(self.data.workers),
         }
 
         # Budget utilization
@@ -890,11 +1521,11 @@ class RestaurantSchedulerModel:
             stats['budget_utilization'] = (self.solution['total_cost'] / self.data.budget_constraint.max_total_cost) * 100
 
         # Fairness metrics
-        hours_list = [h for h in self.solution['worker_hours'].values() if h > 0]
-        if hours_list:
-            stats['max_worker_hours'] = max(hours_list)
-            stats['min_worker_hours'] = min(hours_list)
-            stats['hours_variance'] = sum((h - stats['avg_hours_per_worker'])**2 for h in hours_list) / len(hours_list)
+        # Spread of working staff's hours around the all-worker average
+        if worked.size:
+            stats['max_worker_hours'] = float(worked.max())
+            stats['min_worker_hours'] = float(worked.min())
+            stats['hours_variance'] = float(np.mean((worked - stats['avg_hours_per_worker']) ** 2))
 
         return stats
 
@@ -922,26 +1553,337 @@ class RestaurantSchedulerModel:
         print("-" * 80)
 
         for worker_id in sorted(self.data.workers):
-            worker_shifts = [a for a in self.solution['assignments'] if a['worker_id'] == worker_id]
+            worker_shifts = self.solution['worker_assignments'][worker_id]
 
             if worker_shifts:
                 total_hours = self.solution['worker_hours'][worker_id]
                 hourly_rate = self.data.labor_cost[worker_id]
-                worker_cost = sum(a['cost'] for a in worker_shifts)
+                worker_cost = self.solution['worker_cost'][worker_id]
 
                 print(f"\n{worker_id} - ${hourly_rate:.2f}/hr - {total_hours:.1f}h - ${worker_cost:.2f}")
 
-                for assignment in sorted(worker_shifts, key=lambda a: (self.data.get_day_index(a['shift'].day), a['shift'].start_time)):
+                for assignment in worker_shifts:
                     shift = assignment['shift']
                     print(f"  • {shift}")
 
         print("\n" + "=" * 80)
 
 
+# ============================================================================
+# TABU SEARCH REFINEMENT
+# ============================================================================
+
+# Below this many worker x shift cells a single walk beats paying for
+# process start-up in parallel_solve()
+PARALLEL_MIN_CELLS = 5000
+
+
+class TabuSearch:
+    """
+    Tabu Search over a (n_workers, n_shifts) uint8 assignment matrix.
+
+    A move hands one worker's place on a shift to another worker who is
+    available for it and qualifies for exactly the same requirements of
+    that shift, so every coverage equality keeps holding. Workers who count
+    toward none of a shift's requirements can also simply be dropped. The remaining
+    hard constraints (weekly hours, overlap/rest conflicts, consecutive
+    days, total and daily budget) are checked incrementally per move, and
+    each step takes the cheapest admissible non-tabu neighbor.
+
+    Hours and costs are integer-scaled exactly like RestaurantSchedulerModel,
+    so any schedule accepted here satisfies the CP-SAT model too and the
+    objective values are directly comparable.
+    """
+
+    def __init__(self, data: RestaurantSchedulingData, conflicts: np.ndarray,
+                 cost_scale: int = 100, tabu_tenure: int = 10, sample_size: int = 32):
+        """
+        Args:
+            data: Scheduling data (finalized on demand)
+            conflicts: (n_shifts, n_shifts) bool matrix of shift pairs one
+                worker may not hold together (overlap or insufficient rest)
+            cost_scale: Integer scale applied to hours and costs
+            tabu_tenure: Iterations a worker stays barred from a shift they left
+            sample_size: Assigned (worker, shift) cells sampled per iteration
+        """
+        data.finalize()
+        self.data = data
+        self.tabu_tenure = tabu_tenure
+        self.sample_size = sample_size
+        self.n_days = len(data.days_order)
+
+        self.cost = (data.labor_cost_arr[:, None] * data.shift_duration_arr[None, :] * cost_scale).astype(np.int64)
+        self.hours = data.shift_minutes_arr * cost_scale // 60
+        self.max_hours = (data.max_hours_arr * cost_scale).astype(np.int64)
+        self.shift_day = data.shift_day_arr
+        self.conflicts = conflicts
+
+        budget = data.budget_constraint
+        self.budget_cap = int(budget.max_total_cost * cost_scale) if budget else None
+        self.daily_cap = int(budget.max_daily_cost * cost_scale) if budget and budget.max_daily_cost else None
+
+        # A limit of a full week or more can never bind
+        self.check_consecutive = data.fairness_constraints.max_consecutive_days < self.n_days
+        self.day_bits = np.left_shift(1, np.arange(self.n_days))
+
+        # Workers share a swap group on a shift when they qualify for the
+        # same set of its requirements. Group 0 counts toward no requirement
+        # at all; -1 marks workers unavailable for the shift.
+        self.group = np.full(data.can_work.shape, -1, dtype=np.int32)
+        for j, shift in enumerate(data.shifts):
+            requirements = data.shift_requirements[shift.shift_id]
+            eligible = data.requirement_eligibility(requirements)
+            signatures: Dict[Tuple[bool, ...], int] = {(False,) * len(requirements): 0}
+
+            for i in np.flatnonzero(data.can_work[:, j]):
+                signature = tuple(eligible[i].tolist())
+                self.group[i, j] = signatures.setdefault(signature, len(signatures))
+
+    def run(self, initial: np.ndarray, seed: Any = 0, time_limit: float = 10.0,
+            max_iterations: int = 10000) -> Tuple[np.ndarray, int]:
+        """
+        Refine a feasible assignment.
+
+        Args:
+            initial: Feasible (n_workers, n_shifts) 0/1 matrix to start from
+            seed: Seed (int or np.random.SeedSequence) for move sampling
+            time_limit: Wall-clock budget in seconds
+            max_iterations: Upper bound on search steps
+
+        Returns:
+            Tuple of (best assignment found, its scaled total cost)
+        """
+        rng = np.random.default_rng(seed)
+        assignment = initial.astype(np.uint8, copy=True)
+        day_onehot = np.eye(self.n_days, dtype=np.int64)[self.shift_day]
+
+        worker_hours = assignment @ self.hours
+        worker_days = assignment.astype(np.int64) @ day_onehot
+        day_cost = (assignment * self.cost).sum(axis=0) @ day_onehot
+        total = int(day_cost.sum())
+
+        shift_workers = [list(np.flatnonzero(assignment[:, j])) for j in range(assignment.shape[1])]
+        staffed = [j for j, workers in enumerate(shift_workers) if workers]
+
+        best_assignment = assignment.copy()
+        best_total = total
+        if not staffed:
+            return best_assignment, best_total
+
+        # Iteration until which a worker may not retake a shift they left
+        tabu_until = np.full(assignment.shape, -1, dtype=np.int64)
+        deadline = time.monotonic() + time_limit
+
+        for iteration in range(max_iterations):
+            if not staffed or time.monotonic() > deadline:
+                break
+
+            # Draw the whole neighborhood sample for this step in two calls
+            shift_picks = rng.integers(0, len(staffed), size=self.sample_size)
+            worker_picks = rng.random(self.sample_size)
+
+            pick_shift = np.array([staffed[pick] for pick in shift_picks.tolist()])
+            pick_worker = np.array([
+                shift_workers[j][int(fraction * len(shift_workers[j]))]
+                for j, fraction in zip(pick_shift.tolist(), worker_picks.tolist())
+            ])
+            pick_group = self.group[pick_worker, pick_shift]
+            pick_cost = self.cost[pick_worker, pick_shift]
+
+            # Surplus workers - dropping them never breaks coverage
+            drops = np.flatnonzero(pick_group == 0)
+
+            # Every same-group replacement for every sampled seat, scored as one batch
+            same_group = (self.group[:, pick_shift].T == pick_group[:, None]) & (assignment[:, pick_shift].T == 0)
+            same_group[drops] = False
+            move_pick, move_in = np.nonzero(same_group)
+            move_shift = pick_shift[move_pick]
+            deltas = self.cost[move_in, move_shift] - pick_cost[move_pick]
+
+            # Tabu unless it would beat the best schedule seen (aspiration)
+            allowed = (tabu_until[move_in, move_shift] <= iteration) | (total + deltas < best_total)
+            allowed &= self._admissible(assignment, worker_hours, worker_days, day_cost, total,
+                                        move_shift, move_in, deltas)
+
+            # Cheapest move wins, ties to the earliest sample then lowest
+            # worker index; drops have no incoming worker (-1)
+            move_delta = np.concatenate([-pick_cost[drops], deltas[allowed]])
+            move_pick = np.concatenate([drops, move_pick[allowed]])
+            move_in = np.concatenate([np.full(len(drops), -1), move_in[allowed]])
+            if len(move_delta) == 0:
+                break
+
+            best = np.lexsort((move_in, move_pick, move_delta))[0]
+            j = int(pick_shift[move_pick[best]])
+            w_out = int(pick_worker[move_pick[best]])
+            w_in = int(move_in[best]) if move_in[best] >= 0 else None
+            best_delta = int(move_delta[best])
+
+            day = self.shift_day[j]
+            assignment[w_out, j] = 0
+            worker_hours[w_out] -= self.hours[j]
+            worker_days[w_out, day] -= 1
+            shift_workers[j].remove(w_out)
+            if w_in is not None:
+                assignment[w_in, j] = 1
+                worker_hours[w_in] += self.hours[j]
+                worker_days[w_in, day] += 1
+                shift_workers[j].append(w_in)
+            elif not shift_workers[j]:
+                staffed.remove(j)
+            day_cost[day] += best_delta
+            total += best_delta
+            tabu_until[w_out, j] = iteration + self.tabu_tenure
+
+            if total < best_total:
+                best_total = total
+                best_assignment = assignment.copy()
+
+        return best_assignment, best_total
+
+    def _admissible(self, assignment: np.ndarray, worker_hours: np.ndarray, worker_days: np.ndarray,
+                    day_cost: np.ndarray, total: int, shifts: np.ndarray, candidates: np.ndarray,
+                    deltas: np.ndarray) -> np.ndarray:
+        """
+        Check the hard constraints for a batch of (shift, incoming worker) moves.
+
+        Args:
+            shifts: Shift index of each move
+            candidates: Worker picking up the shift in each move
+            deltas: Scaled cost change of each move
+
+        Returns:
+            bool mask over the moves
+        """
+        ok = worker_hours[candidates] + self.hours[shifts] <= self.max_hours[candidates]
+        ok &= ~np.logical_and(assignment[candidates], self.conflicts[shifts]).any(axis=1)
+
+        if self.budget_cap is not None:
+            ok &= total + deltas <= self.budget_cap
+
+        days = self.shift_day[shifts]
+        if self.daily_cap is not None:
+            ok &= day_cost[days] + deltas <= self.daily_cap
+
+        # No run of worked days longer than allowed once this day is added
+        if self.check_consecutive:
+            day_masks = (worker_days[candidates] > 0) @ self.day_bits
+            ok &= self.data.consecutive_days_ok(day_masks | np.left_shift(1, days))
+
+        return ok
+
+
+# Problem shared with forked walkers; set only while parallel_solve() runs
+_WALK_STATE: Optional[Tuple[TabuSearch, np.ndarray, float, int]] = None
+
+
+def _run_walk(seed: np.random.SeedSequence) -> Tuple[np.ndarray, int]:
+    """Entry point for one forked Tabu walker."""
+    search, initial, time_limit, max_iterations = _WALK_STATE
+    return search.run(initial, seed=seed, time_limit=time_limit, max_iterations=max_iterations)
+
+
+def parallel_solve(search: TabuSearch, initial: np.ndarray, n_walkers: Optional[int] = None,
+                   time_limit: float = 10.0, seed: int = 0,
+                   max_iterations: int = 10000) -> Tuple[np.ndarray, int]:
+    """
+    Multi-walk Tabu Search: run independent walks with different seeds and
+    keep the best result.
+
+    Walkers are forked so they inherit the finalized, read-only problem
+    arrays copy-on-write; only a seed goes in and the winning matrix comes
+    back. Seeds are spawned from one SeedSequence so the walks draw from
+    statistically independent streams. Small instances, and platforms
+    without fork, run a single walk in-process, where start-up cost would
+    outweigh the extra walks.
+
+    Args:
+        search: Configured TabuSearch
+        initial: Feasible starting assignment
+        n_walkers: Number of walks (default: CPU count)
+        time_limit: Wall-clock budget per walk in seconds
+        seed: Root seed for the walkers' random streams
+        max_iterations: Upper bound on search steps per walk
+
+    Returns:
+        Tuple of (best assignment found, its scaled total cost)
+    """
+    global _WALK_STATE
+
+    n_walkers = n_walkers or os.cpu_count() or 1
+    if (n_walkers <= 1 or initial.size < PARALLEL_MIN_CELLS or
+            "fork" not in multiprocessing.get_all_start_methods()):
+        return search.run(initial, seed=seed, time_limit=time_limit, max_iterations=max_iterations)
+
+    _WALK_STATE = (search, initial, time_limit, max_iterations)
+    try:
+        with multiprocessing.get_context("fork").Pool(n_walkers) as pool:
+            results = pool.map(_run_walk, np.random.SeedSequence(seed).spawn(n_walkers))
+    finally:
+        _WALK_STATE = None
+
+    return min(results, key=lambda result: result[1])
+
+
 # ============================================================================
 # SAMPLE RESTAURANT DATA GENERATOR
 # ============================================================================
 
+# Sample restaurant: (worker_id, skills, hourly_rate, max_hours)
+_SAMPLE_WORKERS: Tuple[Tuple[str, Tuple[str, ...], float, float], ...] = (
+    # Servers
+    ("SERVER_001", ("Server", "Host"), 15.00, 40.0),
+    ("SERVER_002", ("Server",), 14.00, 35.0),
+    ("SERVER_003", ("Server", "Bartender"), 16.00, 40.0),
+    ("SERVER_004", ("Server",), 14.00, 30.0),
+    ("SERVER_005", ("Server", "Opening"), 15.50, 38.0),
+
+    # Cooks
+    ("COOK_001", ("Cook", "Prep_Cook", "Opening"), 22.00, 40.0),
+    ("COOK_002", ("Cook", "Sous_Chef"), 24.00, 40.0),
+    ("COOK_003", ("Cook", "Prep_Cook"), 20.00, 35.0),
+
+    # Support staff
+    ("HOST_001", ("Host", "Opening"), 13.00, 30.0),
+    ("HOST_002", ("Host",), 13.00, 25.0),
+    ("BUSSER_001", ("Busser",), 12.00, 30.0),
+    ("BUSSER_002", ("Busser",), 12.00, 25.0),
+
+    # Manager
+    ("MANAGER_001", ("Manager", "Server", "Opening", "Closing"), 28.00, 45.0),
+
+    # Dishwasher
+    ("DISH_001", ("Dishwasher",), 13.00, 40.0),
+    ("DISH_002", ("Dishwasher",), 13.00, 30.0),
+)
+
+# Daily shifts: (id prefix, start, end, type, opening duties, closing duties,
+# requirements as (role, count, required_skill))
+_SAMPLE_SHIFT_TEMPLATES = (
+    # Prep shift (6:00-10:00) - Early morning prep
+    ("PREP", "06:00", "10:00", ShiftType.PREP, True, False, (
+        ("Prep_Cook", 1, "Opening"),
+    )),
+    # Lunch shift (10:00-16:00)
+    ("LUNCH", "10:00", "16:00", ShiftType.LUNCH, False, False, (
+        ("Server", 3, None),
+        ("Cook", 2, None),
+        ("Host", 1, None),
+        ("Busser", 1, None),
+        ("Dishwasher", 1, None),
+    )),
+    # Dinner shift (16:00-23:00) - closing duties except on Sunday
+    ("DINNER", "16:00", "23:00", ShiftType.DINNER, False, True, (
+        ("Server", 4, None),
+        ("Cook", 2, None),
+        ("Host", 1, None),
+        ("Busser", 2, None),
+        ("Dishwasher", 1, None),
+        ("Manager", 1, None),
+    )),
+)
+
+
 def create_sample_restaurant_data() -> RestaurantSchedulingData:
     """
     Create sample data for a mid-sized restaurant with realistic constraints.
@@ -968,33 +1910,11 @@ def create_sample_restaurant_data() -> RestaurantSchedulingData:
     )
 
     # Add workers (servers, cooks, hosts, busser)
-    # Servers
-    data.add_worker("SERVER_001", ["Server", "Host"], 15.00, max_hours=40.0)
-    data.add_worker("SERVER_002", ["Server"], 14.00, max_hours=35.0)
-    data.add_worker("SERVER_003", ["Server", "Bartender"], 16.00, max_hours=40.0)
-    data.add_worker("SERVER_004", ["Server"], 14.00, max_hours=30.0)
-    data.add_worker("SERVER_005", ["Server", "Opening"], 15.50, max_hours=38.0)
-
-    # Cooks
-    data.add_worker("COOK_001", ["Cook", "Prep_Cook", "Opening"], 22.00, max_hours=40.0)
-    data.add_worker("COOK_002", ["Cook", "Sous_Chef"], 24.00, max_hours=40.0)
-    data.add_worker("COOK_003", ["Cook", "Prep_Cook"], 20.00, max_hours=35.0)
-
-    # Support staff
-    data.add_worker("HOST_001", ["Host", "Opening"], 13.00, max_hours=30.0)
-    data.add_worker("HOST_002", ["Host"], 13.00, max_hours=25.0)
-    data.add_worker("BUSSER_001", ["Busser"], 12.00, max_hours=30.0)
-    data.add_worker("BUSSER_002", ["Busser"], 12.00, max_hours=25.0)
-
-    # Manager
-    data.add_worker("MANAGER_001", ["Manager", "Server", "Opening", "Closing"], 28.00, max_hours=45.0)
-
-    # Dishwasher
-    data.add_worker("DISH_001", ["Dishwasher"], 13.00, max_hours=40.0)
-    data.add_worker("DISH_002", ["Dishwasher"], 13.00, max_hours=30.0)
+    for worker_id, skills, hourly_rate, max_hours in _SAMPLE_WORKERS:
+        data.add_worker(worker_id, list(skills), hourly_rate, max_hours=max_hours)
 
     # Add availability (simplified - in real app would come from employee input)
-    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    days = data.days_order
 
     # Most workers available most days (simplified for demo)
     for worker_id in data.workers:
@@ -1016,55 +1936,18 @@ def create_sample_restaurant_data() -> RestaurantSchedulingData:
     shift_id_counter = 1
 
     for day in days:
-        # Prep shift (6:00-10:00) - Early morning prep
-        prep_shift = RestaurantShift(
-            shift_id=f"PREP_{day.upper()}_{shift_id_counter}",
-            day=day,
-            start_time="06:00",
-            end_time="10:00",
-            shift_type=ShiftType.PREP,
-            requires_opening_duties=True
-        )
-        data.add_shift(prep_shift, [
-            ShiftRequirement("Prep_Cook", 1, "Opening"),
-        ])
-        shift_id_counter += 1
-
-        # Lunch shift (10:00-16:00)
-        lunch_shift = RestaurantShift(
-            shift_id=f"LUNCH_{day.upper()}_{shift_id_counter}",
-            day=day,
-            start_time="10:00",
-            end_time="16:00",
-            shift_type=ShiftType.LUNCH
-        )
-        data.add_shift(lunch_shift, [
-            ShiftRequirement("Server", 3, None),
-            ShiftRequirement("Cook", 2, None),
-            ShiftRequirement("Host", 1, None),
-            ShiftRequirement("Busser", 1, None),
-            ShiftRequirement("Dishwasher", 1, None),
-        ])
-        shift_id_counter += 1
-
-        # Dinner shift (16:00-23:00)
-        dinner_shift = RestaurantShift(
-            shift_id=f"DINNER_{day.upper()}_{shift_id_counter}",
-            day=day,
-            start_time="16:00",
-            end_time="23:00",
-            shift_type=ShiftType.DINNER,
-            requires_closing_duties=(day != "Sunday")  # No closing on Sunday
-        )
-        data.add_shift(dinner_shift, [
-            ShiftRequirement("Server", 4, None),
-            ShiftRequirement("Cook", 2, None),
-            ShiftRequirement("Host", 1, None),
-            ShiftRequirement("Busser", 2, None),
-            ShiftRequirement("Dishwasher", 1, None),
-            ShiftRequirement("Manager", 1, None),
-        ])
-        shift_id_counter += 1
+        for prefix, start, end, shift_type, opening, closing, requirements in _SAMPLE_SHIFT_TEMPLATES:
+            shift = RestaurantShift(
+                shift_id=f"{prefix}_{day.upper()}_{shift_id_counter}",
+                day=day,
+                start_time=start,
+                end_time=end,
+                shift_type=shift_type,
+                requires_opening_duties=opening,
+                requires_closing_duties=closing and day != "Sunday"  # No closing on Sunday
+            )
+            data.add_shift(shift, [ShiftRequirement(*req) for req in requirements])
+            shift_id_counter += 1
 
     return data
 
@@ -1075,6 +1958,8 @@ def create_sample_restaurant_data() -> RestaurantSchedulingData:
 
 def main():
     """Demonstrate the enhanced restaurant scheduling engine."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
     print("=" * 80)
     print("RESTAURANT SCHEDULING ENGINE WITH ADVANCED METAHEURISTICS")
     print("OptaPlanner-inspired: First Fit Decreasing + Tabu Search + Budget Optimization")
@@ -12,53 +12,112 @@ Usage:
 
 import sys
 import json
+import logging
+import os
+import tempfile
 import traceback
-from typing import Dict, List, Any
+from collections import Counter
+from dataclasses import asdict, dataclass, field, is_dataclass
+from functools import lru_cache
+from typing import Dict, List, Any, Optional
+
+try:
+    import orjson  # Optional: faster JSON load/dump
+except ImportError:
+    orjson = None
+
 from restaurant_scheduling_engine import (
     RestaurantSchedulingData,
     RestaurantSchedulerModel,
-    RestaurantShift,
     ShiftType,
-    ShiftRequirement,
-    TimeSlot,
     BudgetConstraint,
-    FairnessConstraints
+    FairnessConstraints,
+    infer_shift_type
 )
 
 
+log = logging.getLogger(__name__)
+
+
+def _json_default(value: Any) -> Any:
+    """stdlib json fallback for the dataclasses orjson serializes natively."""
+    if is_dataclass(value):
+        return asdict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_bytes(value: Any) -> bytes:
+    """Serialize one value to compact JSON bytes (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SERIALIZE_DATACLASS)
+    return json.dumps(value, default=_json_default).encode()
+
+
+@dataclass(slots=True)
+class FormattedAssignment:
+    """One assignment as written to the output JSON."""
+    worker_id: str
+    shift_id: str
+    day: str
+    start_time: str
+    end_time: str
+    duration_hours: float
+    shift_type: str
+    cost: float
+
+
+@dataclass(slots=True)
+class RunnerResult:
+    """Runner outcome; each field becomes a top-level key of the output JSON."""
+    success: bool = False
+    solution: Optional[Dict[str, Any]] = None
+    coverage_gaps: List[Dict[str, Any]] = field(default_factory=list)
+    budget_metrics: Dict[str, Any] = field(default_factory=dict)
+    fairness_metrics: Dict[str, Any] = field(default_factory=dict)
+    messages: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+
+@lru_cache(maxsize=256)
+def _gap_reason(eligible_count: int, needed_count: int) -> str:
+    """Human-readable coverage gap reason; gaps repeat the same few counts."""
+    if eligible_count == 0:
+        return "No workers available with required skills and availability"
+    elif eligible_count < needed_count:
+        return f"Only {eligible_count} eligible workers, need {needed_count}"
+    else:
+        return "Scheduling conflict (budget, fairness, or hour constraints)"
+
+
 class RestaurantSchedulingRunner:
     """JSON interface for the restaurant scheduling engine."""
 
     def __init__(self):
         self.data = None
         self.scheduler = None
-        self.result = {
-            "success": False,
-            "solution": None,
-            "coverage_gaps": [],
-            "budget_metrics": {},
-            "fairness_metrics": {},
-            "messages": [],
-            "errors": []
-        }
+        self.result = RunnerResult()
+
+        # Set once coverage gaps are filled in; reset by new data or a new scheduler
+        self._coverage_gaps_computed = False
 
     def load_input_data(self, input_data: Dict[str, Any]) -> bool:
         """Load scheduling data from JSON input with budget and fairness constraints."""
         try:
             # Validate input data structure
             if not isinstance(input_data, dict):
-                self.result["errors"].append("Input data must be a dictionary")
+                self.result.errors.append("Input data must be a dictionary")
                 return False
 
             if not input_data.get("workers"):
-                self.result["errors"].append("No workers provided in input data")
+                self.result.errors.append("No workers provided in input data")
                 return False
 
             if not input_data.get("shifts"):
-                self.result["errors"].append("No shifts provided in input data")
+                self.result.errors.append("No shifts provided in input data")
                 return False
 
             self.data = RestaurantSchedulingData()
+            self._coverage_gaps_computed = False
 
             # Load budget constraints (NEW!)
             budget_config = input_data.get("budget", {})
@@ -78,114 +137,45 @@ class RestaurantSchedulingRunner:
                     min_rest_hours=float(fairness_config.get("min_rest_hours", 12.0))
                 )
 
-            # Load workers
-            for worker in input_data.get("workers", []):
-                self.data.add_worker(
-                    worker_id=worker["id"],
-                    skills=worker.get("skills", []),
-                    hourly_rate=float(worker.get("hourly_rate", 15.0)),
-                    max_hours=float(worker.get("max_hours", 40.0)),
-                    min_hours=float(worker.get("min_hours", 0.0))
-                )
-
-                # Add availability
-                availability = []
-                for slot in worker.get("availability", []):
-                    availability.append(TimeSlot(
-                        day=slot["day"],
-                        start_time=slot["start_time"],
-                        end_time=slot["end_time"]
-                    ))
-
-                if availability:
-                    self.data.add_availability(worker["id"], availability)
-
-            # Load shifts (with restaurant-specific enhancements)
-            for shift in input_data.get("shifts", []):
-                requirements = []
-                for req in shift.get("requirements", []):
-                    requirements.append(ShiftRequirement(
-                        role=req["role"],
-                        count=int(req["count"]),
-                        required_skill=req.get("required_skill")
-                    ))
-
-                # Determine shift type from time or explicit type
-                shift_type = self._determine_shift_type(
-                    shift.get("shift_type"),
-                    shift["start_time"],
-                    shift["end_time"]
-                )
-
-                restaurant_shift = RestaurantShift(
-                    shift_id=shift["id"],
-                    day=shift["day"],
-                    start_time=shift["start_time"],
-                    end_time=shift["end_time"],
-                    shift_type=shift_type,
-                    section=shift.get("section"),
-                    requires_opening_duties=shift.get("requires_opening_duties", False),
-                    requires_closing_duties=shift.get("requires_closing_duties", False)
-                )
+            # Load workers and shifts (with restaurant-specific enhancements)
+            # in one pass; bulk_load also finalizes the lookup arrays
+            self.data.bulk_load(input_data.get("workers", []), input_data.get("shifts", []))
 
-                self.data.add_shift(restaurant_shift, requirements)
-
-            self.result["messages"].append(
+            self.result.messages.append(
                 f"Loaded {len(self.data.workers)} workers and {len(self.data.shifts)} shifts"
             )
 
             if self.data.budget_constraint:
-                self.result["messages"].append(
+                self.result.messages.append(
                     f"Budget: ${self.data.budget_constraint.max_total_cost:.2f} weekly cap"
                 )
 
             return True
 
         except Exception as e:
-            self.result["errors"].append(f"Error loading input data: {str(e)}")
-            traceback.print_exc()
+            self.result.errors.append(f"Error loading input data: {str(e)}")
+            log.debug("Input loading failed", exc_info=True)
             return False
 
     def _determine_shift_type(self, explicit_type: str, start_time: str, end_time: str) -> ShiftType:
         """Determine shift type from explicit type or infer from times."""
-        if explicit_type:
-            type_map = {
-                "Prep": ShiftType.PREP,
-                "Opening": ShiftType.OPENING,
-                "Lunch": ShiftType.LUNCH,
-                "Dinner": ShiftType.DINNER,
-                "Closing": ShiftType.CLOSING,
-                "Double": ShiftType.DOUBLE
-            }
-            return type_map.get(explicit_type, ShiftType.LUNCH)
-
-        # Infer from start time
-        start_hour = int(start_time.split(':')[0])
-
-        if start_hour < 8:
-            return ShiftType.PREP
-        elif start_hour < 11:
-            return ShiftType.OPENING
-        elif start_hour < 14:
-            return ShiftType.LUNCH
-        elif start_hour < 17:
-            return ShiftType.LUNCH  # Late lunch
-        else:
-            return ShiftType.DINNER
+        return infer_shift_type(explicit_type, start_time)
 
     def run_scheduling(self, constraints: Dict[str, Any] = {}) -> bool:
         """Execute the advanced scheduling algorithm."""
         try:
             if not self.data:
-                self.result["errors"].append("No input data loaded")
+                self.result.errors.append("No input data loaded")
                 return False
 
             time_limit = constraints.get("time_limit", 60)
+            strategy = constraints.get("strategy", "cp-sat")
 
-            self.result["messages"].append("Creating advanced restaurant scheduler (OptaPlanner-inspired)...")
-            self.result["messages"].append("Algorithms: First Fit Decreasing + Tabu Search + CP-SAT")
+            self.result.messages.append("Creating advanced restaurant scheduler (OptaPlanner-inspired)...")
+            self.result.messages.append("Algorithms: First Fit Decreasing + Tabu Search + CP-SAT")
 
             self.scheduler = RestaurantSchedulerModel(self.data)
+            self._coverage_gaps_computed = False
 
             # Build the optimization model
             self.scheduler.create_variables()
@@ -193,24 +183,28 @@ class RestaurantSchedulingRunner:
             self.scheduler.add_soft_constraints_to_objective()
             self.scheduler.define_objective()
 
-            self.result["messages"].append(f"Running metaheuristic solver (limit: {time_limit}s)...")
+            self.result.messages.append(f"Running metaheuristic solver (limit: {time_limit}s)...")
 
-            # Solve the model
-            success = self.scheduler.solve_model(time_limit_seconds=time_limit)
+            # Solve the model ("hybrid": short CP-SAT run, then Tabu Search refinement)
+            if strategy == "hybrid":
+                cp_time = min(5, time_limit)
+                success = self.scheduler.solve_hybrid(cp_time_budget=cp_time, tabu_time_budget=time_limit - cp_time)
+            else:
+                success = self.scheduler.solve_model(time_limit_seconds=time_limit)
 
             if success:
                 self._process_successful_solution()
-                self.result["success"] = True
-                self.result["messages"].append("✓ Schedule optimized successfully!")
+                self.result.success = True
+                self.result.messages.append("✓ Schedule optimized successfully!")
             else:
                 self._analyze_scheduling_failure()
-                self.result["messages"].append("✗ Could not find feasible schedule")
+                self.result.messages.append("✗ Could not find feasible schedule")
 
             return success
 
         except Exception as e:
-            self.result["errors"].append(f"Scheduling error: {str(e)}")
-            traceback.print_exc()
+            self.result.errors.append(f"Scheduling error: {str(e)}")
+            log.debug("Scheduling failed", exc_info=True)
             return False
 
     def _process_successful_solution(self):
@@ -218,18 +212,19 @@ class RestaurantSchedulingRunner:
         solution_data = self.scheduler.solution
 
         # Format assignments for JSON output
-        formatted_assignments = []
-        for assignment in solution_data["assignments"]:
-            formatted_assignments.append({
-                "worker_id": assignment["worker_id"],
-                "shift_id": assignment["shift_id"],
-                "day": assignment["shift"].day,
-                "start_time": assignment["shift"].start_time,
-                "end_time": assignment["shift"].end_time,
-                "duration_hours": assignment["shift"].duration_hours,
-                "shift_type": assignment["shift"].shift_type.value,
-                "cost": round(assignment["cost"], 2)
-            })
+        formatted_assignments = [
+            FormattedAssignment(
+                worker_id=assignment["worker_id"],
+                shift_id=assignment["shift_id"],
+                day=assignment["shift"].day,
+                start_time=assignment["shift"].start_time,
+                end_time=assignment["shift"].end_time,
+                duration_hours=assignment["shift"].duration_hours,
+                shift_type=assignment["shift"].shift_type.value,
+                cost=round(assignment["cost"], 2)
+            )
+            for assignment in solution_data["assignments"]
+        ]
 
         # Format worker hours
         worker_hours = {
@@ -260,7 +255,7 @@ class RestaurantSchedulingRunner:
             "shift_balance_score": self._calculate_shift_balance_score(solution_data)
         }
 
-        self.result["solution"] = {
+        self.result.solution = {
             "assignments": formatted_assignments,
             "worker_hours": worker_hours,
             "total_cost": round(solution_data["total_cost"], 2),
@@ -268,33 +263,32 @@ class RestaurantSchedulingRunner:
             "statistics": stats
         }
 
-        self.result["budget_metrics"] = budget_metrics
-        self.result["fairness_metrics"] = fairness_metrics
+        self.result.budget_metrics = budget_metrics
+        self.result.fairness_metrics = fairness_metrics
 
-        # Check for any uncovered shifts
-        self._identify_coverage_gaps()
+        # Check for any uncovered shifts - none are possible when every
+        # requirement was enforced as a hard coverage constraint
+        if solution_data.get("all_hard_constraints_satisfied"):
+            self.result.coverage_gaps = []
+            self._coverage_gaps_computed = True
+        else:
+            self._identify_coverage_gaps()
 
     def _calculate_shift_balance_score(self, solution_data: Dict[str, Any]) -> float:
         """Calculate a fairness score based on shift distribution (0-100)."""
         try:
-            hours_list = [h for h in solution_data.get("worker_hours", {}).values() if h > 0]
+            hours = solution_data["worker_hours_arr"]
+            hours = hours[hours > 0]
 
             # Handle edge cases
-            if not hours_list:
+            if hours.size == 0:
                 return 100.0  # Perfect score if no assignments (weird but safe)
 
-            if len(hours_list) == 1:
+            if hours.size == 1:
                 return 100.0  # Single worker = perfect balance
 
-            avg = sum(hours_list) / len(hours_list)
-
-            # Handle zero average (shouldn't happen but be safe)
-            if avg == 0:
-                return 100.0
-
-            # Calculate variance
-            variance = sum((h - avg) ** 2 for h in hours_list) / len(hours_list)
-            std_dev = variance ** 0.5
+            # Population standard deviation of hours among working staff
+            std_dev = float(hours.std())
 
             # Convert to 0-100 score (lower variance = higher score)
             # Assume std_dev of 0 = perfect (100), std_dev of 10+ = poor (0)
@@ -321,38 +315,38 @@ class RestaurantSchedulingRunner:
         if self.data.budget_constraint:
             messages.append(f"• Current budget: ${self.data.budget_constraint.max_total_cost:.2f}")
 
-        self.result["messages"].extend(messages)
+        self.result.messages.extend(messages)
 
     def _identify_coverage_gaps(self):
         """Identify shifts that cannot be covered and why."""
+        # Already analyzed for this scheduler - the result cannot change
+        if self._coverage_gaps_computed:
+            return
+
         coverage_gaps = []
 
         for shift in self.data.shifts:
             shift_requirements = self.data.shift_requirements[shift.shift_id]
 
-            for requirement in shift_requirements:
-                # Find eligible workers
-                eligible_workers = []
+            # Availability does not depend on the requirement - read the
+            # shift's column of the precomputed availability matrix once
+            workable = self.data.available_workers(shift.shift_id)
 
-                for worker_id in self.data.workers:
-                    if not self.data.worker_can_work_shift(worker_id, shift):
-                        continue
+            # Assigned staff per skill, counted once for all requirements
+            if self.scheduler and self.scheduler.solution:
+                assigned_workers = self.scheduler.solution["shift_assignments"].get(shift.shift_id, [])
+                skill_counts = Counter(skill for w in assigned_workers for skill in self.data.worker_skills[w])
 
-                    if not self.data.worker_has_skill(worker_id, requirement.required_skill):
-                        continue
-
-                    eligible_workers.append(worker_id)
+            for requirement in shift_requirements:
+                # Find eligible workers
+                eligible_workers = [
+                    w for w in workable if self.data.worker_has_skill(w, requirement.required_skill)
+                ]
 
                 # Check if requirement is covered
                 if self.scheduler and self.scheduler.solution:
-                    assigned_workers = self.scheduler.solution["shift_assignments"].get(shift.shift_id, [])
-
                     if requirement.required_skill:
-                        skilled_assigned = [
-                            w for w in assigned_workers
-                            if self.data.worker_has_skill(w, requirement.required_skill)
-                        ]
-                        assigned_count = len(skilled_assigned)
+                        assigned_count = skill_counts[requirement.required_skill]
                     else:
                         assigned_count = len(assigned_workers)
 
@@ -384,24 +378,66 @@ class RestaurantSchedulingRunner:
                     }
                     coverage_gaps.append(gap)
 
-        self.result["coverage_gaps"] = coverage_gaps
+        self.result.coverage_gaps = coverage_gaps
+        self._coverage_gaps_computed = True
 
     def _get_gap_reason(self, eligible_count: int, needed_count: int) -> str:
         """Generate a human-readable reason for the coverage gap."""
-        if eligible_count == 0:
-            return "No workers available with required skills and availability"
-        elif eligible_count < needed_count:
-            return f"Only {eligible_count} eligible workers, need {needed_count}"
-        else:
-            return "Scheduling conflict (budget, fairness, or hour constraints)"
+        return _gap_reason(eligible_count, needed_count)
 
     def save_results(self, output_path: str):
-        """Save results to JSON file."""
+        """
+        Save results to JSON file.
+
+        Written piece by piece as compact JSON, one line per assignment, so
+        a large schedule is never held in memory as a second, fully
+        serialized copy. The stream goes to a temporary file that replaces
+        output_path only once complete; if serializing fails, output_path
+        gets a minimal failure result carrying the error instead of a
+        truncated document.
+        """
+        tmp_path = None
         try:
-            with open(output_path, 'w') as f:
-                json.dump(self.result, f, indent=2)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(output_path)), suffix=".tmp"
+            )
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in self._iter_result_json():
+                    f.write(chunk)
+            os.replace(tmp_path, output_path)
         except Exception as e:
-            self.result["errors"].append(f"Error saving results: {str(e)}")
+            self.result.errors.append(f"Error saving results: {str(e)}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            try:
+                with open(output_path, 'wb') as f:
+                    f.write(_json_bytes({"success": False, "errors": self.result.errors}))
+            except Exception:
+                log.debug("Writing the failure result failed", exc_info=True)
+
+    def _iter_result_json(self):
+        """Yield self.result as JSON bytes, streaming solution.assignments."""
+        yield b"{"
+        for i, key in enumerate(RunnerResult.__slots__):
+            value = getattr(self.result, key)
+            yield (b",\n" if i else b"\n") + _json_bytes(key) + b": "
+
+            if key != "solution" or not value:
+                yield _json_bytes(value)
+                continue
+
+            yield b"{"
+            for k, (solution_key, solution_value) in enumerate(value.items()):
+                yield (b", " if k else b"") + _json_bytes(solution_key) + b": "
+                if solution_key == "assignments":
+                    yield b"["
+                    for n, assignment in enumerate(solution_value):
+                        yield (b",\n" if n else b"\n") + _json_bytes(assignment)
+                    yield b"]"
+                else:
+                    yield _json_bytes(solution_value)
+            yield b"}"
+        yield b"\n}\n"
 
 
 def main():
@@ -417,8 +453,12 @@ def main():
 
     try:
         # Load input data
-        with open(input_file, 'r') as f:
-            input_data = json.load(f)
+        if orjson is not None:
+            with open(input_file, 'rb') as f:
+                input_data = orjson.loads(f.read())
+        else:
+            with open(input_file, 'r') as f:
+                input_data = json.load(f)
 
         # Extract constraints
         constraints = input_data.get("constraints", {})
@@ -431,29 +471,29 @@ def main():
         runner.save_results(output_file)
 
         # Print summary to stdout
-        if runner.result["success"]:
-            print(f"SUCCESS: Schedule generated with {len(runner.result['solution']['assignments'])} assignments")
-            print(f"Total cost: ${runner.result['solution']['total_cost']:.2f}")
+        if runner.result.success:
+            print(f"SUCCESS: Schedule generated with {len(runner.result.solution['assignments'])} assignments")
+            print(f"Total cost: ${runner.result.solution['total_cost']:.2f}")
 
-            if runner.result["budget_metrics"]:
-                print(f"Budget utilization: {runner.result['budget_metrics']['utilization_percent']:.1f}%")
+            if runner.result.budget_metrics:
+                print(f"Budget utilization: {runner.result.budget_metrics['utilization_percent']:.1f}%")
 
-            if runner.result["fairness_metrics"]:
-                print(f"Shift balance score: {runner.result['fairness_metrics']['shift_balance_score']:.1f}/100")
+            if runner.result.fairness_metrics:
+                print(f"Shift balance score: {runner.result.fairness_metrics['shift_balance_score']:.1f}/100")
 
-            if runner.result["coverage_gaps"]:
-                print(f"WARNING: {len(runner.result['coverage_gaps'])} coverage gaps identified")
+            if runner.result.coverage_gaps:
+                print(f"WARNING: {len(runner.result.coverage_gaps)} coverage gaps identified")
         else:
             print("FAILED: Could not generate schedule")
-            print(f"Errors: {len(runner.result['errors'])}")
-            print(f"Coverage gaps: {len(runner.result['coverage_gaps'])}")
+            print(f"Errors: {len(runner.result.errors)}")
+            print(f"Coverage gaps: {len(runner.result.coverage_gaps)}")
 
     except Exception as e:
         print(f"ERROR: {str(e)}")
         traceback.print_exc()
 
         # Save error result
-        runner.result["errors"].append(str(e))
+        runner.result.errors.append(str(e))
         runner.save_results(output_file)
         sys.exit(1)
 
@@ -15,16 +15,20 @@ Author: Claude Code
 Date: 2025-10-13
 """
 
+from collections import Counter, defaultdict
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+from datetime import datetime
+from typing import List, DefaultDict, Dict, FrozenSet, Iterable, Mapping, NamedTuple, Optional, Tuple, Any
 from enum import Enum
+from operator import attrgetter
+from types import MappingProxyType
 
 
 # ============================================================================
 # TASK 1: INPUT DATA CLASSES
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class ConstraintConflict:
     """
     Represents a primary hard constraint violation in the scheduling system.
@@ -36,22 +40,25 @@ class ConstraintConflict:
         shift_id: Unique identifier for the problematic shift
         role: The role/position that needs to be filled
         required_count: Number of workers needed for this role
-        missing_skills: List of skills that are lacking in available workers
+        missing_skills: Skills that are lacking in available workers (any
+                        iterable; stored as a tuple, in the given order)
     """
     shift_id: str
     role: str
     required_count: int
-    missing_skills: List[str]
+    missing_skills: Tuple[str, ...]
 
     def __post_init__(self):
         """Validate the constraint conflict data."""
+        if not isinstance(self.missing_skills, tuple):
+            self.missing_skills = tuple(self.missing_skills)
         if self.required_count < 0:
             raise ValueError("required_count must be non-negative")
         if not self.shift_id or not self.role:
             raise ValueError("shift_id and role must be non-empty")
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkerStatus:
     """
     Represents the availability and capability status of a worker in relation
@@ -63,26 +70,32 @@ class WorkerStatus:
     Attributes:
         worker_id: Unique identifier for the worker
         is_available: Whether the worker is available during the shift time
-        available_skills: List of skills this worker possesses
+        available_skills: Skills this worker possesses (any iterable; stored
+                         as a frozenset so membership tests are O(1))
         conflict_reason: Brief explanation of why this worker can't be assigned
                         Examples: 'Not enough hours', 'Scheduled elsewhere',
                                 'Missing certification', 'Time-off requested'
     """
     worker_id: str
     is_available: bool
-    available_skills: List[str]
+    available_skills: FrozenSet[str]
     conflict_reason: str
 
+    def __post_init__(self):
+        """Freeze the skill collection for hashed lookups."""
+        if not isinstance(self.available_skills, frozenset):
+            self.available_skills = frozenset(self.available_skills)
+
     def has_skill(self, skill: str) -> bool:
         """Check if worker has a specific skill."""
         return skill in self.available_skills
 
-    def skill_gap(self, required_skills: List[str]) -> List[str]:
+    def skill_gap(self, required_skills: Iterable[str]) -> List[str]:
         """Return list of required skills this worker is missing."""
         return [skill for skill in required_skills if skill not in self.available_skills]
 
 
-@dataclass
+@dataclass(slots=True)
 class PenaltyReport:
     """
     Represents non-critical soft constraint violations that contribute to
@@ -107,7 +120,7 @@ class PenaltyReport:
             raise ValueError("penalty_score must be non-negative")
 
 
-@dataclass
+@dataclass(slots=True)
 class CandidateMove:
     """
     Represents a pre-computed, low-impact worker reassignment that might
@@ -135,10 +148,149 @@ class CandidateMove:
             raise ValueError("source and target shifts must be different")
 
 
+# Key functions for picking the best move / worst penalty
+_IMPACT = attrgetter("impact_score")
+_PENALTY = attrgetter("penalty_score")
+
+
+# ============================================================================
+# ANALYSIS FUNCTIONS
+# ============================================================================
+# Pure functions over the input dataclasses: no engine state, no globals.
+# DiagnosticEngine.generate_summary uses analyze_worker_pool for the whole
+# pool and find_closest_match for one-off lookups; both describe the
+# closest match with _match_summary.
+
+def _match_summary(ws: WorkerStatus, matching_count: int, required_skills: Iterable[str]) -> Dict[str, Any]:
+    """Describe a closest-match worker (shared by find_closest_match and analyze_worker_pool)."""
+    required_skills = list(required_skills)
+    return {
+        'worker_id': ws.worker_id,
+        'matching_skills_count': matching_count,
+        'total_required_skills': len(required_skills),
+        'missing_skills': ws.skill_gap(required_skills),
+        'is_available': ws.is_available,
+        'conflict_reason': ws.conflict_reason if not ws.is_available else None
+    }
+
+
+def find_closest_match(
+    worker_statuses: List[WorkerStatus],
+    required_skills: List[str]
+) -> Optional[Dict[str, Any]]:
+    """
+    Identify the worker who is closest to having all required skills.
+
+    Ties go to the first worker in the list.
+
+    Args:
+        worker_statuses: List of worker status objects
+        required_skills: Skills needed for the shift
+
+    Returns:
+        Dictionary with worker_id, matching_skills count, and missing_skills list
+        Returns None if no workers exist
+    """
+    if not worker_statuses or not required_skills:
+        return None
+
+    required_set = frozenset(required_skills)
+    best_ws = worker_statuses[0]
+    best_match_count = -1
+
+    for ws in worker_statuses:
+        matching_count = len(required_set & ws.available_skills)
+
+        if matching_count > best_match_count:
+            best_match_count = matching_count
+            best_ws = ws
+            # Nobody later can beat a full match, and ties keep the first
+            if best_match_count == len(required_set):
+                break
+
+    return _match_summary(best_ws, best_match_count, required_skills)
+
+
+def analyze_worker_pool(
+    conflict: ConstraintConflict,
+    worker_statuses: List[WorkerStatus]
+) -> Tuple[Dict[str, int], Counter, Dict[str, List[str]], Optional[Dict[str, Any]]]:
+    """
+    Analyze the worker pool for a conflict in a single pass.
+
+    Each worker is visited once and every aggregate (staffing gap, skill
+    gaps, unavailable workers by reason, closest match) is updated from the
+    same iteration, instead of re-scanning the pool per statistic.
+
+    Args:
+        conflict: The constraint conflict being diagnosed
+        worker_statuses: List of worker status objects
+
+    Returns:
+        Tuple of (staffing gap with 'needed', 'available' and 'shortfall'
+        counts; how many workers lack each missing skill; unavailable worker
+        IDs by conflict reason, in input order; closest match as
+        find_closest_match returns it). The skill gap counts are a Counter
+        seeded in missing_skills order, so most_common(1) breaks ties like
+        max() does
+    """
+    required_skills = conflict.missing_skills
+    required_set = frozenset(required_skills)
+    skill_gaps = Counter(dict.fromkeys(required_skills, 0))
+    workers_by_reason: DefaultDict[str, List[str]] = defaultdict(list)
+    available_workers = 0
+    best_ws = None
+    best_match_count = -1
+
+    for ws in worker_statuses:
+        if ws.is_available:
+            available_workers += 1
+        else:
+            workers_by_reason[ws.conflict_reason].append(ws.worker_id)
+
+        skills = ws.available_skills
+        if required_skills:
+            skill_gaps.update(required_set - skills)
+            if best_match_count == len(required_set):
+                # A full match is already found; it can't be beaten
+                continue
+            matching_count = len(required_set & skills)
+            if matching_count > best_match_count:
+                best_match_count = matching_count
+                best_ws = ws
+
+    gap = {
+        'needed': conflict.required_count,
+        'available': available_workers,
+        'shortfall': max(0, conflict.required_count - available_workers)
+    }
+
+    closest_match = None
+    if best_ws is not None:
+        closest_match = _match_summary(best_ws, best_match_count, required_skills)
+
+    return gap, skill_gaps, dict(workers_by_reason), closest_match
+
+
+def _pool_key(conflict: ConstraintConflict, worker_statuses: List[WorkerStatus]) -> tuple:
+    """Hashable snapshot of every input field analyze_worker_pool reads."""
+    return (
+        conflict.required_count,
+        tuple(conflict.missing_skills),
+        tuple(
+            (ws.worker_id, ws.is_available, ws.conflict_reason, ws.available_skills)
+            for ws in worker_statuses
+        ),
+    )
+
+
 # ============================================================================
 # TASK 2: DIAGNOSTIC ENGINE
 # ============================================================================
 
+# Pool analyses remembered per DiagnosticEngine (oldest evicted first)
+_POOL_CACHE_SIZE = 256
+
 class DiagnosticEngine:
     """
     Analyzes CP solver failure data to produce structured diagnostic summaries.
@@ -157,6 +309,7 @@ class DiagnosticEngine:
     def __init__(self):
         """Initialize the diagnostic engine."""
         self.last_analysis: Optional[Dict[str, Any]] = None
+        self._pool_cache: Dict[tuple, tuple] = {}
 
     def generate_summary(self, conflict_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -192,46 +345,37 @@ class DiagnosticEngine:
         conflict: ConstraintConflict = conflict_data['conflict']
         worker_statuses: List[WorkerStatus] = conflict_data['worker_statuses']
 
-        # Calculate staffing gap
-        available_workers = sum(1 for ws in worker_statuses if ws.is_available)
-        staffing_gap = {
-            'needed': conflict.required_count,
-            'available': available_workers,
-            'shortfall': max(0, conflict.required_count - available_workers)
-        }
+        # Staffing gap, per-skill gaps, unavailability breakdown and the
+        # closest match worker, all from one pass over the pool. Re-analysing
+        # an unchanged conflict/pool reuses the previous result.
+        key = _pool_key(conflict, worker_statuses)
+        analysis = self._pool_cache.get(key)
+        if analysis is None:
+            analysis = analyze_worker_pool(conflict, worker_statuses)
+            if len(self._pool_cache) >= _POOL_CACHE_SIZE:
+                del self._pool_cache[next(iter(self._pool_cache))]
+            self._pool_cache[key] = analysis
+        gap, skill_gaps, workers_by_reason, closest_match_worker = analysis
+        available_workers = gap['available']
+
+        # Summaries are handed to callers, so they get their own containers
+        gap = dict(gap)
+        workers_by_reason = {reason: list(ids) for reason, ids in workers_by_reason.items()}
+        if closest_match_worker is not None:
+            closest_match_worker = dict(closest_match_worker)
+            closest_match_worker['missing_skills'] = list(closest_match_worker['missing_skills'])
 
         # Identify the most critical missing skill
-        # Count how many workers lack each required skill
-        skill_gaps: Dict[str, int] = {}
-        for skill in conflict.missing_skills:
-            workers_lacking = sum(
-                1 for ws in worker_statuses
-                if not ws.has_skill(skill)
-            )
-            skill_gaps[skill] = workers_lacking
-
-        critical_missing_skill = max(skill_gaps.items(), key=lambda x: x[1])[0] if skill_gaps else None
-
-        # Analyze worker unavailability patterns
-        workers_by_reason: Dict[str, List[str]] = {}
-        for ws in worker_statuses:
-            if not ws.is_available:
-                reason = ws.conflict_reason
-                if reason not in workers_by_reason:
-                    workers_by_reason[reason] = []
-                workers_by_reason[reason].append(ws.worker_id)
-
-        # Find the worker who most nearly meets requirements (closest match)
-        closest_match_worker = self._find_closest_match(
-            worker_statuses,
-            conflict.missing_skills
-        )
+        # (the one the most workers lack)
+        critical_missing_skill = skill_gaps.most_common(1)[0][0] if skill_gaps else None
 
-        # Build structured summary
+        # Build structured summary in a single literal. Conditional fields
+        # belong in a local extras dict merged once ({**summary, **extras}),
+        # not in per-key assignments after the fact.
         summary = {
             'shift_id': conflict.shift_id,
             'role': conflict.role,
-            'staffing_gap': staffing_gap,
+            'staffing_gap': gap,
             'critical_missing_skill': critical_missing_skill,
             'all_missing_skills': conflict.missing_skills,
             'available_workers_count': available_workers,
@@ -252,54 +396,47 @@ class DiagnosticEngine:
         worker_statuses: List[WorkerStatus],
         required_skills: List[str]
     ) -> Optional[Dict[str, Any]]:
-        """
-        Identify the worker who is closest to having all required skills.
-
-        Args:
-            worker_statuses: List of worker status objects
-            required_skills: Skills needed for the shift
-
-        Returns:
-            Dictionary with worker_id, matching_skills count, and missing_skills list
-            Returns None if no workers exist
-        """
-        if not worker_statuses or not required_skills:
-            return None
-
-        best_match = None
-        best_match_count = -1
-
-        for ws in worker_statuses:
-            matching_count = sum(1 for skill in required_skills if ws.has_skill(skill))
-
-            if matching_count > best_match_count:
-                best_match_count = matching_count
-                missing_skills = ws.skill_gap(required_skills)
-                best_match = {
-                    'worker_id': ws.worker_id,
-                    'matching_skills_count': matching_count,
-                    'total_required_skills': len(required_skills),
-                    'missing_skills': missing_skills,
-                    'is_available': ws.is_available,
-                    'conflict_reason': ws.conflict_reason if not ws.is_available else None
-                }
-
-        return best_match
+        """Identify the worker closest to having all required skills (see find_closest_match)."""
+        return find_closest_match(worker_statuses, required_skills)
 
     def _get_timestamp(self) -> str:
         """Generate a timestamp for the analysis."""
-        from datetime import datetime
         return datetime.now().isoformat()
 
-    def get_last_analysis(self) -> Optional[Dict[str, Any]]:
-        """Retrieve the last analysis performed (useful for debugging)."""
-        return self.last_analysis
+    def get_last_analysis(self) -> Optional[Mapping[str, Any]]:
+        """Retrieve a read-only view of the last analysis (useful for debugging)."""
+        if self.last_analysis is None:
+            return None
+        return MappingProxyType(self.last_analysis)
+
+    def clear_cache(self):
+        """Forget remembered pool analyses."""
+        self._pool_cache.clear()
 
 
 # ============================================================================
 # TASK 3: RECOMMENDATION ENGINE
 # ============================================================================
 
+# Summary keys the tip generators read unconditionally
+_REQUIRED_SUMMARY_KEYS = frozenset(('shift_id', 'role', 'critical_missing_skill', 'closest_match_worker'))
+
+
+class AuditEntry(NamedTuple):
+    """
+    One recommendation_history record.
+
+    Attributes:
+        summary: The diagnostic summary the tips were generated from (the
+                 caller's dict, referenced rather than copied)
+        recommendations: The generated tips, in strategic/tactical/immediate order
+        timestamp: ISO timestamp of when the tips were generated
+    """
+    summary: Dict[str, Any]
+    recommendations: List[str]
+    timestamp: str
+
+
 class RecommendationEngine:
     """
     Generates actionable recommendations based on diagnostic summaries.
@@ -316,7 +453,7 @@ class RecommendationEngine:
 
     def __init__(self):
         """Initialize the recommendation engine."""
-        self.recommendation_history: List[Dict[str, Any]] = []
+        self.recommendation_history: List[AuditEntry] = []
 
     def generate_tips(
         self,
@@ -344,10 +481,9 @@ class RecommendationEngine:
             ValueError: If summary is missing required keys
         """
         # Validate input
-        required_keys = ['shift_id', 'role', 'critical_missing_skill', 'closest_match_worker']
-        for key in required_keys:
-            if key not in summary:
-                raise ValueError(f"summary must contain '{key}' key")
+        missing = _REQUIRED_SUMMARY_KEYS - summary.keys()
+        if missing:
+            raise ValueError(f"summary must contain {', '.join(repr(k) for k in sorted(missing))} key(s)")
 
         recommendations = []
 
@@ -364,11 +500,9 @@ class RecommendationEngine:
         recommendations.append(immediate_tip)
 
         # Store for potential audit trail
-        self.recommendation_history.append({
-            'summary': summary,
-            'recommendations': recommendations,
-            'timestamp': self._get_timestamp()
-        })
+        self.recommendation_history.append(
+            AuditEntry(summary, recommendations, self._get_timestamp())
+        )
 
         return recommendations
 
@@ -445,7 +579,7 @@ class RecommendationEngine:
             )
 
         # Find the best move (lowest impact score)
-        best_move = min(move_data, key=lambda m: m.impact_score)
+        best_move = min(move_data, key=_IMPACT)
 
         reason_clause = f" ({best_move.reason})" if best_move.reason else ""
 
@@ -477,7 +611,7 @@ class RecommendationEngine:
             )
 
         # Find the soft constraint with highest penalty
-        worst_penalty = max(penalty_data, key=lambda p: p.penalty_score)
+        worst_penalty = max(penalty_data, key=_PENALTY)
 
         tip = (
             f"[IMMEDIATE FIX] Temporarily relax soft constraint '{worst_penalty.soft_constraint_id}' "
@@ -489,12 +623,15 @@ class RecommendationEngine:
 
     def _get_timestamp(self) -> str:
         """Generate a timestamp for the recommendation."""
-        from datetime import datetime
         return datetime.now().isoformat()
 
-    def get_recommendation_history(self) -> List[Dict[str, Any]]:
-        """Retrieve the history of recommendations generated (useful for audit)."""
-        return self.recommendation_history
+    def get_recommendation_history(self) -> Tuple[AuditEntry, ...]:
+        """Retrieve the history of recommendations generated (useful for audit).
+
+        Returns an immutable snapshot; entries are AuditEntry tuples, use
+        entry._asdict() for a plain dict.
+        """
+        return tuple(self.recommendation_history)
 
 
 # ============================================================================
@@ -569,7 +706,7 @@ def main():
     ]
     print(f"Worker Statuses: {len(worker_statuses)} workers analyzed")
     for ws in worker_statuses:
-        print(f"  - {ws.worker_id}: Available={ws.is_available}, Skills={ws.available_skills}")
+        print(f"  - {ws.worker_id}: Available={ws.is_available}, Skills={sorted(ws.available_skills)}")
     print()
 
     # Soft constraint penalties
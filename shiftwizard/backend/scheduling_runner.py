@@ -57,17 +57,72 @@ Output JSON format:
 }
 """
 
+import os
 import sys
 import json
+import time
 import traceback
-from typing import Dict, List, Any
-from workforce_scheduling_engine import (
-    SchedulingInputData, 
-    SchedulerModel,
-    Shift,
-    ShiftRequirement,
-    TimeSlot
-)
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, is_dataclass
+from itertools import repeat
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+try:
+    import orjson  # Optional: faster JSON load/dump
+except ImportError:
+    orjson = None
+
+from workforce_scheduling_engine import SchedulingInputData, SchedulerModel
+
+
+# Fixed gap reasons, shared by every gap that has them
+NO_ELIGIBLE_WORKERS_REASON = "No workers available with required skills and availability"
+CONSTRAINT_CONFLICT_REASON = "Scheduling conflict with other constraints"
+
+
+@dataclass(slots=True)
+class CoverageGap:
+    """
+    A shift requirement that is (or cannot be) left understaffed.
+
+    Serialized to the same JSON object as before: orjson encodes
+    dataclasses natively, and the json fallback goes through
+    _json_default.
+    """
+    shift_id: str
+    day: str
+    time_range: str
+    missing_staff: int
+    required_role: str
+    required_skill: Optional[str]
+    eligible_workers: int
+    reason: str
+
+
+def _json_default(obj: Any) -> Any:
+    """json.dump hook for result values that aren't plain JSON types."""
+    if is_dataclass(obj):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _solve_subproblem(
+    data: SchedulingInputData,
+    time_limit: float,
+    num_workers: int
+) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """Build and solve one independent sub-problem (runs in a worker process)."""
+    scheduler = SchedulerModel(data)
+    scheduler.create_variables()
+    scheduler.add_hard_constraints()
+    scheduler.define_objective()
+    scheduler.add_greedy_hint()
+    success = scheduler.solve_model(time_limit_seconds=time_limit, num_workers=num_workers)
+    return success, scheduler.solution
+
 
 class SchedulingRunner:
     """JSON interface for the scheduling engine."""
@@ -75,6 +130,8 @@ class SchedulingRunner:
     def __init__(self):
         self.data = None
         self.scheduler = None
+        # Fingerprint of the data self.scheduler's model was built from
+        self._model_fingerprint: Optional[str] = None
         self.result = {
             "success": False,
             "solution": None,
@@ -88,45 +145,8 @@ class SchedulingRunner:
         try:
             self.data = SchedulingInputData()
             
-            # Load workers
-            for worker in input_data.get("workers", []):
-                self.data.add_worker(
-                    worker_id=worker["id"],
-                    skills=worker.get("skills", []),
-                    hourly_rate=float(worker.get("hourly_rate", 15.0)),
-                    max_hours=float(worker.get("max_hours", 40.0)),
-                    min_hours=float(worker.get("min_hours", 0.0))
-                )
-                
-                # Add availability
-                availability = []
-                for slot in worker.get("availability", []):
-                    availability.append(TimeSlot(
-                        day=slot["day"],
-                        start_time=slot["start_time"],
-                        end_time=slot["end_time"]
-                    ))
-                
-                if availability:
-                    self.data.add_availability(worker["id"], availability)
-            
-            # Load shifts
-            for shift in input_data.get("shifts", []):
-                requirements = []
-                for req in shift.get("requirements", []):
-                    requirements.append(ShiftRequirement(
-                        role=req["role"],
-                        count=int(req["count"]),
-                        required_skill=req.get("required_skill")
-                    ))
-                
-                self.data.add_shift(
-                    shift_id=shift["id"],
-                    day=shift["day"],
-                    start_time=shift["start_time"],
-                    end_time=shift["end_time"],
-                    requirements=requirements
-                )
+            # Load workers (with availability) and shifts in one pass
+            self.data.bulk_load(input_data.get("workers", []), input_data.get("shifts", []))
             
             # Validate data
             is_valid, errors = self.data.validate()
@@ -148,49 +168,130 @@ class SchedulingRunner:
                 self.result["errors"].append("No input data loaded")
                 return False
             
+            fingerprint = self.data.fingerprint()
+            if self._can_reuse_model(fingerprint):
+                # Same input as the last serial solve: re-solve the built
+                # model, starting from the previous schedule
+                self.result["messages"].append("Reusing scheduling model from previous run...")
+                self.scheduler.hint_previous_solution()
+                self.scheduler.solution = None
+                self.result["messages"].append(f"Running solver with {time_limit}s time limit...")
+                success = self.scheduler.solve_model(time_limit_seconds=time_limit)
+                return self._finish_run(success)
+
             self.result["messages"].append("Creating scheduling model...")
             self.scheduler = SchedulerModel(self.data)
-            
-            # Build the optimization model
-            self.scheduler.create_variables()
-            self.scheduler.add_hard_constraints()
-            self.scheduler.define_objective()
-            
-            self.result["messages"].append(f"Running solver with {time_limit}s time limit...")
-            
-            # Solve the model
-            success = self.scheduler.solve_model(time_limit_seconds=time_limit)
-            
-            if success:
-                self._process_successful_solution()
-                self.result["success"] = True
-                self.result["messages"].append("Schedule generated successfully!")
+            self._model_fingerprint = fingerprint
+
+            day_problems = self._parallel_day_problems()
+            if day_problems:
+                # Independent days: build and solve each in its own process
+                success = self._solve_days_in_parallel(day_problems, time_limit)
             else:
-                self._analyze_scheduling_failure()
-                self.result["messages"].append("Could not find feasible schedule")
+                # Build the optimization model
+                self.scheduler.create_variables()
+                self.scheduler.add_hard_constraints()
+                self.scheduler.define_objective()
+                self.scheduler.add_greedy_hint()
+                
+                self.result["messages"].append(f"Running solver with {time_limit}s time limit...")
+                
+                # Solve the model
+                success = self.scheduler.solve_model(time_limit_seconds=time_limit)
             
-            return success
+            return self._finish_run(success)
             
         except Exception as e:
             self.result["errors"].append(f"Scheduling error: {str(e)}")
             return False
 
+    def _can_reuse_model(self, fingerprint: str) -> bool:
+        """
+        Whether the model built by the previous run can be solved again.
+
+        Only a serially built model (the parallel path keeps no model)
+        that solved successfully, for input with the same fingerprint,
+        qualifies; anything else is rebuilt from scratch.
+        """
+        return (
+            self.scheduler is not None
+            and bool(self.scheduler.x)
+            and self.scheduler.solution is not None
+            and fingerprint == self._model_fingerprint
+        )
+
+    def _finish_run(self, success: bool) -> bool:
+        """Record the outcome of a solve in the result."""
+        if success:
+            self._process_successful_solution()
+            self.result["success"] = True
+            self.result["messages"].append("Schedule generated successfully!")
+        else:
+            self._analyze_scheduling_failure()
+            self.result["messages"].append("Could not find feasible schedule")
+        
+        return success
+
+    def _parallel_day_problems(self) -> Optional[List[SchedulingInputData]]:
+        """
+        Per-day sub-problems to solve in parallel, or None to solve serially.
+
+        Only worthwhile with more than one CPU and more than one day, and
+        only exact when no worker's weekly hour limit can bind
+        (see SchedulingInputData.split_by_day).
+        """
+        if (os.cpu_count() or 1) < 2:
+            return None
+        day_problems = self.data.split_by_day()
+        if not day_problems or len(day_problems) < 2:
+            return None
+        return day_problems
+
+    def _solve_days_in_parallel(self, day_problems: List[SchedulingInputData], time_limit: int) -> bool:
+        """Solve independent day sub-problems in a process pool and merge them."""
+        cpus = os.cpu_count() or 1
+        n_procs = min(len(day_problems), max(1, cpus // 2))
+        # Split the CPUs between the processes so CP-SAT doesn't oversubscribe,
+        # and the time limit between the waves of days so the total still fits
+        search_workers = max(1, cpus // n_procs)
+        waves = -(-len(day_problems) // n_procs)
+        day_time_limit = time_limit / waves
+
+        self.result["messages"].append(
+            f"Running solver on {len(day_problems)} independent days "
+            f"({n_procs} processes, {day_time_limit:g}s time limit per day)..."
+        )
+
+        start_time = time.time()
+        with ProcessPoolExecutor(max_workers=n_procs) as pool:
+            results = list(pool.map(
+                _solve_subproblem, day_problems, repeat(day_time_limit), repeat(search_workers)
+            ))
+        solve_time = time.time() - start_time
+
+        if not all(success for success, _ in results):
+            return False
+
+        self.scheduler.adopt_solutions([solution for _, solution in results], solve_time)
+        return True
+
     def _process_successful_solution(self):
         """Process a successful scheduling solution."""
         solution_data = self.scheduler.solution
         
         # Format assignments for JSON output
-        formatted_assignments = []
-        for assignment in solution_data["assignments"]:
-            formatted_assignments.append({
+        formatted_assignments = [
+            {
                 "worker_id": assignment["worker_id"],
                 "shift_id": assignment["shift_id"],
-                "day": assignment["shift"].day,
-                "start_time": assignment["shift"].start_time,
-                "end_time": assignment["shift"].end_time,
-                "duration_hours": assignment["shift"].duration_hours,
+                "day": (shift := assignment["shift"]).day,
+                "start_time": shift.start_time,
+                "end_time": shift.end_time,
+                "duration_hours": shift.duration_hours,
                 "cost": round(assignment["cost"], 2)
-            })
+            }
+            for assignment in solution_data["assignments"]
+        ]
         
         # Format worker hours
         worker_hours = {
@@ -226,81 +327,116 @@ class SchedulingRunner:
     def _identify_coverage_gaps(self):
         """Identify shifts that cannot be covered and why."""
         coverage_gaps = []
-        
+
+        # Precompute, once per call, who can work each shift and who holds
+        # each skill; eligibility per requirement is then a set intersection
+        available_by_shift = self._available_workers_by_shift()
+        workers_by_skill: Dict[str, set] = {}
+        for worker_id in self.data.workers:
+            for skill in self.data.worker_skills.get(worker_id, []):
+                workers_by_skill.setdefault(skill, set()).add(worker_id)
+
+        # With a solution, count once per shift how many assigned workers
+        # hold each skill, so each requirement's coverage is one lookup
+        shift_assignments = None
+        assigned_skill_counts: Dict[str, Counter] = {}
+        if self.scheduler and self.scheduler.solution:
+            shift_assignments = self.scheduler.solution["shift_assignments"]
+            assigned_skill_counts = {
+                shift_id: Counter(
+                    skill
+                    for w in assigned
+                    for skill in set(self.data.worker_skills.get(w, ()))
+                )
+                for shift_id, assigned in shift_assignments.items()
+            }
+
         for shift in self.data.shifts:
             shift_requirements = self.data.shift_requirements[shift.shift_id]
+            available = available_by_shift[shift.shift_id]
             
             for requirement in shift_requirements:
-                # Find workers who can work this shift and have required skills
-                eligible_workers = []
-                
-                for worker_id in self.data.workers:
-                    # Check availability
-                    if not self.data.worker_can_work_shift(worker_id, shift):
-                        continue
-                    
-                    # Check skills
-                    if not self.data.worker_has_skill(worker_id, requirement.required_skill):
-                        continue
-                    
-                    eligible_workers.append(worker_id)
+                # Workers who can work this shift and have the required skill
+                if requirement.required_skill is None:
+                    eligible_workers = available
+                else:
+                    eligible_workers = available & workers_by_skill.get(requirement.required_skill, set())
                 
                 # If we have a solution, check if this requirement is actually covered
-                if self.scheduler and self.scheduler.solution:
-                    assigned_workers = self.scheduler.solution["shift_assignments"].get(shift.shift_id, [])
+                if shift_assignments is not None:
+                    assigned_workers = shift_assignments.get(shift.shift_id, [])
                     # Filter by skill requirement if needed
                     if requirement.required_skill:
-                        skilled_assigned = [
-                            w for w in assigned_workers 
-                            if self.data.worker_has_skill(w, requirement.required_skill)
-                        ]
-                        assigned_count = len(skilled_assigned)
+                        skill_counts = assigned_skill_counts.get(shift.shift_id)
+                        assigned_count = skill_counts[requirement.required_skill] if skill_counts else 0
                     else:
                         assigned_count = len(assigned_workers)
                     
                     if assigned_count < requirement.count:
-                        gap = {
-                            "shift_id": shift.shift_id,
-                            "day": shift.day,
-                            "time_range": f"{shift.start_time}-{shift.end_time}",
-                            "missing_staff": requirement.count - assigned_count,
-                            "required_role": requirement.role,
-                            "required_skill": requirement.required_skill,
-                            "eligible_workers": len(eligible_workers),
-                            "reason": self._get_gap_reason(len(eligible_workers), requirement.count - assigned_count)
-                        }
-                        coverage_gaps.append(gap)
+                        coverage_gaps.append(CoverageGap(
+                            shift_id=shift.shift_id,
+                            day=shift.day,
+                            time_range=f"{shift.start_time}-{shift.end_time}",
+                            missing_staff=requirement.count - assigned_count,
+                            required_role=requirement.role,
+                            required_skill=requirement.required_skill,
+                            eligible_workers=len(eligible_workers),
+                            reason=self._get_gap_reason(len(eligible_workers), requirement.count - assigned_count)
+                        ))
                 
                 # If no solution, check if there are enough eligible workers
                 elif len(eligible_workers) < requirement.count:
-                    gap = {
-                        "shift_id": shift.shift_id,
-                        "day": shift.day,
-                        "time_range": f"{shift.start_time}-{shift.end_time}",
-                        "missing_staff": requirement.count - len(eligible_workers),
-                        "required_role": requirement.role,
-                        "required_skill": requirement.required_skill,
-                        "eligible_workers": len(eligible_workers),
-                        "reason": self._get_gap_reason(len(eligible_workers), requirement.count)
-                    }
-                    coverage_gaps.append(gap)
+                    coverage_gaps.append(CoverageGap(
+                        shift_id=shift.shift_id,
+                        day=shift.day,
+                        time_range=f"{shift.start_time}-{shift.end_time}",
+                        missing_staff=requirement.count - len(eligible_workers),
+                        required_role=requirement.role,
+                        required_skill=requirement.required_skill,
+                        eligible_workers=len(eligible_workers),
+                        reason=self._get_gap_reason(len(eligible_workers), requirement.count)
+                    ))
         
         self.result["coverage_gaps"] = coverage_gaps
 
+    def _available_workers_by_shift(self) -> Dict[str, set]:
+        """
+        Map each shift_id to the workers available for it.
+
+        The model already computed the worker x shift availability matrix
+        when it created its variables (x[worker][shift] exists only for
+        available pairs), so reuse it instead of re-checking availability;
+        without a built model, compute the matrix once.
+        """
+        if self.scheduler is not None and self.scheduler.x_exists is not None:
+            available = self.scheduler.x_exists
+        else:
+            available = self.data.availability_matrix()
+
+        workers = self.data.workers
+        return {
+            shift.shift_id: {workers[i] for i in np.flatnonzero(available[:, j])}
+            for j, shift in enumerate(self.data.shifts)
+        }
+
     def _get_gap_reason(self, eligible_count: int, needed_count: int) -> str:
         """Generate a human-readable reason for the coverage gap."""
         if eligible_count == 0:
-            return "No workers available with required skills and availability"
+            return NO_ELIGIBLE_WORKERS_REASON
         elif eligible_count < needed_count:
             return f"Only {eligible_count} eligible workers, need {needed_count}"
         else:
-            return "Scheduling conflict with other constraints"
+            return CONSTRAINT_CONFLICT_REASON
 
     def save_results(self, output_path: str):
         """Save results to JSON file."""
         try:
-            with open(output_path, 'w') as f:
-                json.dump(self.result, f, indent=2)
+            if orjson is not None:
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(self.result, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_path, 'w') as f:
+                    json.dump(self.result, f, indent=2, default=_json_default)
         except Exception as e:
             self.result["errors"].append(f"Error saving results: {str(e)}")
 
@@ -317,8 +453,12 @@ def main():
     
     try:
         # Load input data
-        with open(input_file, 'r') as f:
-            input_data = json.load(f)
+        if orjson is not None:
+            with open(input_file, 'rb') as f:
+                input_data = orjson.loads(f.read())
+        else:
+            with open(input_file, 'r') as f:
+                input_data = json.load(f)
         
         # Process scheduling
         if runner.load_input_data(input_data):
@@ -340,10 +480,12 @@ def main():
     
     except Exception as e:
         print(f"ERROR: {str(e)}")
-        traceback.print_exc()
+        # Full tracebacks go through linecache; only print them when debugging
+        if os.environ.get("SCHEDWIZ_DEBUG"):
+            traceback.print_exc()
         
         # Save error result
-        runner.result["errors"].append(str(e))
+        runner.result["errors"].append("".join(traceback.format_exception_only(type(e), e)).rstrip())
         runner.save_results(output_file)
         sys.exit(1)
 
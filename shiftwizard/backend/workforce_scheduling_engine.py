@@ -16,18 +16,72 @@ Author: Claude Code
 Date: 2025-10-13
 """
 
+import numpy as np
 from ortools.sat.python import cp_model
 from typing import List, Dict, Tuple, Optional, Set, Any
 from dataclasses import dataclass, field
-from datetime import datetime, time, timedelta
+from functools import lru_cache
+import hashlib
 import json
+import logging
+import os
+import sys
 
+log = logging.getLogger(__name__)
 
 # ============================================================================
 # TASK 1: MODEL PARAMETERS AND INPUT DATA STRUCTURES
 # ============================================================================
 
-@dataclass
+@lru_cache(maxsize=4096)
+def _parse_hhmm(value: str) -> int:
+    """Parse an "HH:MM" string into minutes since midnight (memoized)."""
+    hh, mm = value.split(":")
+    return int(hh) * 60 + int(mm)
+
+
+# Day name -> small int, so day equality in hot loops is an int compare
+_DAY_INDEX: Dict[str, int] = {
+    day: i for i, day in enumerate(
+        ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    )
+}
+
+
+def _day_index(day: str) -> int:
+    """Return the integer index of a weekday name; other labels are rejected."""
+    day_idx = _DAY_INDEX.get(day)
+    if day_idx is None:
+        raise ValueError(f"Unknown day '{day}' (expected a weekday name, e.g. 'Monday')")
+    return day_idx
+
+
+# CP-SAT parameters applied by SchedulerModel.solve_model unless overridden.
+# The model is Boolean assignments under sum == k / sum <= 1 constraints,
+# where the full LP relaxation pays off: on 120-worker x 70-shift weeks
+# with a single search worker it reaches optimality in 0.4-7s where the
+# defaults often stop FEASIBLE at 20s. Core-based optimization, extra
+# probing and symmetry detection were no better or slower.
+DEFAULT_SOLVER_PARAMS: Dict[str, Any] = {
+    "linearization_level": 2,
+}
+
+
+def _pack_bits(mask: np.ndarray) -> np.ndarray:
+    """Pack a boolean array's last axis into little-endian uint64 bitsets."""
+    packed = np.packbits(mask, axis=-1, bitorder="little")
+    pad = -packed.shape[-1] % 8
+    if pad:
+        packed = np.concatenate([packed, np.zeros(packed.shape[:-1] + (pad,), dtype=np.uint8)], axis=-1)
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+
+def _unpack_indices(bits: np.ndarray, n: int) -> np.ndarray:
+    """Positions of the set bits among the first n bits of a uint64 bitset."""
+    return np.flatnonzero(np.unpackbits(bits.view(np.uint8), count=n, bitorder="little"))
+
+
+@dataclass(frozen=True, slots=True)
 class Shift:
     """
     Represents a work shift with timing and identification.
@@ -44,24 +98,31 @@ class Shift:
     start_time: str  # Format: "HH:MM"
     end_time: str    # Format: "HH:MM"
 
-    @property
-    def duration_hours(self) -> float:
-        """Calculate shift duration in hours."""
-        start = datetime.strptime(self.start_time, "%H:%M")
-        end = datetime.strptime(self.end_time, "%H:%M")
+    # Derived on construction so hot paths never re-parse the time strings
+    day_idx: int = field(init=False, repr=False, compare=False)
+    start_min: int = field(init=False, repr=False, compare=False)
+    end_min_wrapped: int = field(init=False, repr=False, compare=False)
+    duration_hours: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Pre-parse start/end times into minutes since midnight."""
+        start_min = _parse_hhmm(self.start_time)
+        end_min = _parse_hhmm(self.end_time)
 
         # Handle overnight shifts
-        if end < start:
-            end += timedelta(days=1)
+        end_min_wrapped = end_min + 1440 if end_min < start_min else end_min
 
-        duration = (end - start).total_seconds() / 3600
-        return duration
+        # Frozen dataclass: derived fields are set once, here
+        object.__setattr__(self, "day_idx", _day_index(self.day))
+        object.__setattr__(self, "start_min", start_min)
+        object.__setattr__(self, "end_min_wrapped", end_min_wrapped)
+        object.__setattr__(self, "duration_hours", (end_min_wrapped - start_min) / 60)
 
     def __str__(self):
         return f"{self.shift_id} ({self.day} {self.start_time}-{self.end_time})"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ShiftRequirement:
     """
     Represents staffing requirements for a specific role in a shift.
@@ -75,12 +136,18 @@ class ShiftRequirement:
     count: int
     required_skill: Optional[str] = None
 
+    def __post_init__(self):
+        """Intern role/skill names, which repeat across every shift."""
+        object.__setattr__(self, "role", sys.intern(self.role))
+        if self.required_skill is not None:
+            object.__setattr__(self, "required_skill", sys.intern(self.required_skill))
+
     def __str__(self):
         skill_str = f" (requires {self.required_skill})" if self.required_skill else ""
         return f"{self.count}x {self.role}{skill_str}"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TimeSlot:
     """
     Represents a worker's available time period.
@@ -94,24 +161,28 @@ class TimeSlot:
     start_time: str
     end_time: str
 
+    # Derived on construction so overlap checks are integer comparisons
+    day_idx: int = field(init=False, repr=False, compare=False)
+    start_min: int = field(init=False, repr=False, compare=False)
+    end_min_wrapped: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Pre-parse start/end times into minutes since midnight."""
+        start_min = _parse_hhmm(self.start_time)
+        end_min = _parse_hhmm(self.end_time)
+
+        # Handle overnight availability (frozen: set the derived fields once)
+        object.__setattr__(self, "day_idx", _day_index(self.day))
+        object.__setattr__(self, "start_min", start_min)
+        object.__setattr__(self, "end_min_wrapped", end_min + 1440 if end_min < start_min else end_min)
+
     def overlaps_with_shift(self, shift: Shift) -> bool:
         """Check if this availability slot covers the given shift."""
-        if self.day != shift.day:
+        if self.day_idx != shift.day_idx:
             return False
 
         # For simplicity, check if availability completely covers the shift
-        avail_start = datetime.strptime(self.start_time, "%H:%M")
-        avail_end = datetime.strptime(self.end_time, "%H:%M")
-        shift_start = datetime.strptime(shift.start_time, "%H:%M")
-        shift_end = datetime.strptime(shift.end_time, "%H:%M")
-
-        # Handle overnight shifts
-        if shift_end < shift_start:
-            shift_end += timedelta(days=1)
-        if avail_end < avail_start:
-            avail_end += timedelta(days=1)
-
-        return avail_start <= shift_start and avail_end >= shift_end
+        return self.start_min <= shift.start_min and self.end_min_wrapped >= shift.end_min_wrapped
 
     def __str__(self):
         return f"{self.day} {self.start_time}-{self.end_time}"
@@ -136,15 +207,43 @@ class SchedulingInputData:
         # List of all job roles in the organization
         self.roles: List[str] = []
 
+        # Lookup indexes kept in sync by add_shift
+        self._shift_by_id: Dict[str, Shift] = {}
+        self._roles_set: Set[str] = set()
+
         # Mapping: worker_id -> list of skills they possess
         self.worker_skills: Dict[str, List[str]] = {}
 
+        # Skill name -> bit, and worker_id -> OR of their skill bits, so
+        # worker_has_skill is a single AND (maintained by add_worker)
+        self.skill_bit: Dict[str, int] = {}
+        self.worker_skill_mask: Dict[str, int] = {}
+
         # Mapping: shift_id -> list of ShiftRequirement objects
         self.shift_requirements: Dict[str, List[ShiftRequirement]] = {}
 
         # Mapping: worker_id -> list of TimeSlot objects
         self.worker_availability: Dict[str, List[TimeSlot]] = {}
 
+        # Flat (CSR) copy of the availability built by finalize(): worker i's
+        # slots are rows avail_offsets[i]:avail_offsets[i + 1] of the
+        # day-index / start-minute / wrapped-end-minute arrays, sorted by
+        # (day index, start minute) within each worker
+        self.worker_idx: Dict[str, int] = {}
+        self.avail_offsets: np.ndarray = np.zeros(1, dtype=np.int64)
+        self.avail_day: np.ndarray = np.zeros(0, dtype=np.int32)
+        self.avail_start: np.ndarray = np.zeros(0, dtype=np.int32)
+        self.avail_end: np.ndarray = np.zeros(0, dtype=np.int32)
+
+        # Skill name -> packed uint64 bitset of the workers (by position in
+        # self.workers) holding it, also built by finalize()
+        self.skill_workers: Dict[str, np.ndarray] = {}
+        self._all_workers = np.zeros(0, dtype=np.uint64)
+        self._no_workers = np.zeros(0, dtype=np.uint64)
+        # (role, required_skill) -> bitset of workers holding both
+        self._eligible_cache: Dict[Tuple[str, Optional[str]], np.ndarray] = {}
+        self._finalized = False
+
         # Mapping: worker_id -> hourly pay rate
         self.labor_cost: Dict[str, float] = {}
 
@@ -161,12 +260,65 @@ class SchedulingInputData:
         min_hours: float = 0.0
     ):
         """Add a worker to the scheduling system."""
+        # Skill names repeat across workers and requirements; interning them
+        # makes the skill_bit lookups and equality checks pointer compares
+        skills = [sys.intern(skill) for skill in skills]
+        self._finalized = False
         self.workers.append(worker_id)
         self.worker_skills[worker_id] = skills
+        self.worker_skill_mask[worker_id] = self._skill_mask(skills)
         self.labor_cost[worker_id] = hourly_rate
         self.max_hours_per_week[worker_id] = max_hours
         self.min_hours_per_week[worker_id] = min_hours
 
+    def _skill_mask(self, skills: List[str]) -> int:
+        """OR of the skills' bits, assigning bits to new skills as needed."""
+        mask = 0
+        for skill in skills:
+            bit = self.skill_bit.get(skill)
+            if bit is None:
+                bit = self.skill_bit[skill] = 1 << len(self.skill_bit)
+            mask |= bit
+        return mask
+
+    def bulk_load(self, workers: List[Dict[str, Any]], shifts: List[Dict[str, Any]]):
+        """
+        Load workers and shifts from JSON records in bulk.
+
+        Records use the runner's input format. Worker attributes are filled
+        with one comprehension per dict instead of an add_worker call per
+        row; shifts go through add_shift so shift/role indexing stays in one
+        place.
+
+        Args:
+            workers: Records with id, skills, hourly_rate, max_hours,
+                min_hours and availability [{day, start_time, end_time}]
+            shifts: Records with id, day, start_time, end_time and
+                requirements [{role, count, required_skill}]
+        """
+        self._finalized = False
+        self.workers.extend(w["id"] for w in workers)
+        self.worker_skills.update({
+            w["id"]: [sys.intern(skill) for skill in w.get("skills", [])] for w in workers
+        })
+        self.worker_skill_mask.update({
+            w["id"]: self._skill_mask(self.worker_skills[w["id"]]) for w in workers
+        })
+        self.labor_cost.update({w["id"]: float(w.get("hourly_rate", 15.0)) for w in workers})
+        self.max_hours_per_week.update({w["id"]: float(w.get("max_hours", 40.0)) for w in workers})
+        self.min_hours_per_week.update({w["id"]: float(w.get("min_hours", 0.0)) for w in workers})
+        self.worker_availability.update({
+            w["id"]: [TimeSlot(slot["day"], slot["start_time"], slot["end_time"]) for slot in w["availability"]]
+            for w in workers if w.get("availability")
+        })
+
+        for row in shifts:
+            requirements = [
+                ShiftRequirement(req["role"], int(req["count"]), req.get("required_skill"))
+                for req in row.get("requirements", [])
+            ]
+            self.add_shift(row["id"], row["day"], row["start_time"], row["end_time"], requirements)
+
     def add_shift(
         self,
         shift_id: str,
@@ -178,39 +330,244 @@ class SchedulingInputData:
         """Add a shift with its staffing requirements."""
         shift = Shift(shift_id, day, start_time, end_time)
         self.shifts.append(shift)
+        # First shift with an ID wins, as with the former linear scan
+        self._shift_by_id.setdefault(shift_id, shift)
         self.shift_requirements[shift_id] = requirements
 
         # Track unique roles
         for req in requirements:
-            if req.role not in self.roles:
+            if req.role not in self._roles_set:
+                self._roles_set.add(req.role)
                 self.roles.append(req.role)
 
     def add_availability(self, worker_id: str, time_slots: List[TimeSlot]):
         """Set availability for a worker."""
         self.worker_availability[worker_id] = time_slots
+        self._finalized = False
+
+    def finalize(self):
+        """
+        Flatten worker availability into the CSR arrays.
+
+        Lookups call it lazily whenever workers or availability changed
+        since the last build.
+        """
+        self.worker_idx = {worker_id: i for i, worker_id in enumerate(self.workers)}
+
+        slots = [
+            time_slot
+            for worker_id in self.workers
+            for time_slot in sorted(
+                self.worker_availability.get(worker_id, ()),
+                key=lambda s: (s.day_idx, s.start_min)
+            )
+        ]
+        counts = np.fromiter(
+            (len(self.worker_availability.get(worker_id, ())) for worker_id in self.workers),
+            dtype=np.int64, count=len(self.workers)
+        )
+        self.avail_offsets = np.zeros(len(self.workers) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.avail_offsets[1:])
+        self.avail_day = np.fromiter((s.day_idx for s in slots), dtype=np.int32, count=len(slots))
+        self.avail_start = np.fromiter((s.start_min for s in slots), dtype=np.int32, count=len(slots))
+        self.avail_end = np.fromiter((s.end_min_wrapped for s in slots), dtype=np.int32, count=len(slots))
+
+        rows_by_skill: Dict[str, List[int]] = {}
+        for i, worker_id in enumerate(self.workers):
+            for skill in self.worker_skills.get(worker_id, ()):
+                rows_by_skill.setdefault(skill, []).append(i)
+        has_skill = np.zeros((len(rows_by_skill), len(self.workers)), dtype=bool)
+        for k, rows in enumerate(rows_by_skill.values()):
+            has_skill[k, rows] = True
+        self.skill_workers = dict(zip(rows_by_skill, _pack_bits(has_skill)))
+        self._all_workers = _pack_bits(np.ones(len(self.workers), dtype=bool))
+        self._no_workers = np.zeros_like(self._all_workers)
+        self._eligible_cache = {}
+
+        self._finalized = True
+
+    def workers_with_skill(self, skill: Optional[str]) -> np.ndarray:
+        """
+        Bitset of the workers holding a skill (everyone for None).
+
+        Returns:
+            uint64 words; bit i (little-endian) stands for self.workers[i]
+        """
+        if not self._finalized:
+            self.finalize()
+        if skill is None:
+            return self._all_workers
+        return self.skill_workers.get(skill, self._no_workers)
+
+    def workers_for_requirement(self, role: str, required_skill: Optional[str]) -> np.ndarray:
+        """
+        Bitset of the workers holding both a role and a required skill.
+
+        Computed once per (role, required_skill) and kept until the workers
+        change, so every shift with the same requirement - and every model
+        built from this data - reuses it.
+
+        Returns:
+            uint64 words; bit i (little-endian) stands for self.workers[i]
+        """
+        if not self._finalized:
+            self.finalize()
+        key = (role, required_skill)
+        bits = self._eligible_cache.get(key)
+        if bits is None:
+            bits = self._eligible_cache[key] = (
+                self.workers_with_skill(role) & self.workers_with_skill(required_skill)
+            )
+        return bits
 
     def get_shift(self, shift_id: str) -> Optional[Shift]:
         """Retrieve a shift by ID."""
-        for shift in self.shifts:
-            if shift.shift_id == shift_id:
-                return shift
-        return None
+        return self._shift_by_id.get(shift_id)
 
     def worker_can_work_shift(self, worker_id: str, shift: Shift) -> bool:
         """Check if a worker is available for a specific shift."""
         if worker_id not in self.worker_availability:
             return False
 
-        for time_slot in self.worker_availability[worker_id]:
-            if time_slot.overlaps_with_shift(shift):
-                return True
-        return False
+        if not self._finalized:
+            self.finalize()
+
+        i = self.worker_idx.get(worker_id)
+        if i is None:
+            # Availability for a worker not registered with add_worker
+            return any(time_slot.overlaps_with_shift(shift) for time_slot in self.worker_availability[worker_id])
+
+        # Binary-search the worker's sorted slots down to those on the
+        # shift's day that start no later than the shift; only their ends
+        # are left to check
+        lo, hi = self.avail_offsets[i], self.avail_offsets[i + 1]
+        day = self.avail_day[lo:hi]
+        day_lo = lo + np.searchsorted(day, shift.day_idx, side="left")
+        day_hi = lo + np.searchsorted(day, shift.day_idx, side="right")
+        start_hi = day_lo + np.searchsorted(self.avail_start[day_lo:day_hi], shift.start_min, side="right")
+        return bool(np.any(self.avail_end[day_lo:start_hi] >= shift.end_min_wrapped))
+
+    def availability_matrix(self) -> np.ndarray:
+        """
+        Evaluate worker_can_work_shift for every worker/shift pair at once.
+
+        The CSR availability arrays and the shifts' integer day/start/end
+        are compared with NumPy broadcasting; a worker can work a shift if
+        any of their slots covers it. Each worker's slots are one contiguous
+        run of rows, so that "any" is one reduceat per worker.
+
+        Returns:
+            Boolean array of shape (len(workers), len(shifts)), rows and
+            columns in the order of self.workers and self.shifts
+        """
+        n_workers, n_shifts = len(self.workers), len(self.shifts)
+        available = np.zeros((n_workers, n_shifts), dtype=bool)
+        if not n_workers or not n_shifts:
+            return available
+
+        if not self._finalized:
+            self.finalize()
+        if not len(self.avail_day):
+            return available
+
+        shift_day = np.array([s.day_idx for s in self.shifts])
+        shift_start = np.array([s.start_min for s in self.shifts])
+        shift_end = np.array([s.end_min_wrapped for s in self.shifts])
+
+        covers = (
+            (self.avail_day[:, None] == shift_day)
+            & (self.avail_start[:, None] <= shift_start)
+            & (self.avail_end[:, None] >= shift_end)
+        )
+        has_slots = self.avail_offsets[1:] > self.avail_offsets[:-1]
+        available[has_slots] = np.logical_or.reduceat(covers, self.avail_offsets[:-1][has_slots], axis=0)
+        return available
 
     def worker_has_skill(self, worker_id: str, skill: str) -> bool:
         """Check if a worker possesses a specific skill."""
         if skill is None:
             return True
-        return skill in self.worker_skills.get(worker_id, [])
+        return bool(self.worker_skill_mask.get(worker_id, 0) & self.skill_bit.get(skill, 0))
+
+    def split_by_day(self) -> Optional[List["SchedulingInputData"]]:
+        """
+        Split the problem into independent single-day sub-problems.
+
+        Shifts on different days never overlap, so the only constraint that
+        links days is each worker's weekly hour limit. When no worker's
+        available shifts can add up past that limit (using the same scaled
+        hours the model posts), the days are independent and the week's
+        optimum is the sum of the daily optima.
+
+        Returns:
+            One SchedulingInputData per day, in order of first appearance,
+            or None if some worker's maximum hours could bind across days
+        """
+        SCALE_FACTOR = 100
+
+        # Scaled hours of every shift each worker is available for, from one
+        # matrix-vector product over the availability matrix
+        shift_hours_scaled = np.array(
+            [int(shift.duration_hours * SCALE_FACTOR) for shift in self.shifts], dtype=np.int64
+        )
+        available_hours_scaled = self.availability_matrix() @ shift_hours_scaled
+
+        for worker_id, worker_hours_scaled in zip(self.workers, available_hours_scaled):
+            max_hours = self.max_hours_per_week.get(worker_id, 40.0)
+            if worker_hours_scaled > int(max_hours * SCALE_FACTOR):
+                return None
+
+        shifts_by_day: Dict[str, List[Shift]] = {}
+        for shift in self.shifts:
+            shifts_by_day.setdefault(shift.day, []).append(shift)
+
+        parts = []
+        for day_shifts in shifts_by_day.values():
+            part = SchedulingInputData()
+            for worker_id in self.workers:
+                part.add_worker(
+                    worker_id,
+                    self.worker_skills[worker_id],
+                    self.labor_cost[worker_id],
+                    self.max_hours_per_week[worker_id],
+                    self.min_hours_per_week[worker_id]
+                )
+                if worker_id in self.worker_availability:
+                    part.add_availability(worker_id, self.worker_availability[worker_id])
+            for shift in day_shifts:
+                part.add_shift(
+                    shift.shift_id, shift.day, shift.start_time, shift.end_time,
+                    self.shift_requirements[shift.shift_id]
+                )
+            parts.append(part)
+
+        return parts
+
+    def fingerprint(self) -> str:
+        """
+        Digest of everything the model is built from.
+
+        Two inputs with the same fingerprint produce the same CP-SAT model,
+        so a model built for one can be re-solved for the other.
+
+        Returns:
+            Hex digest string
+        """
+        content = (
+            [
+                (
+                    worker_id,
+                    self.worker_skills[worker_id],
+                    self.labor_cost[worker_id],
+                    self.max_hours_per_week.get(worker_id),
+                    self.min_hours_per_week.get(worker_id),
+                    self.worker_availability.get(worker_id),
+                )
+                for worker_id in self.workers
+            ],
+            [(shift, self.shift_requirements[shift.shift_id]) for shift in self.shifts],
+        )
+        return hashlib.sha1(repr(content).encode()).hexdigest()
 
     def validate(self) -> Tuple[bool, List[str]]:
         """
@@ -227,19 +584,29 @@ class SchedulingInputData:
         if not self.shifts:
             errors.append("No shifts defined")
 
-        # Check that all workers have skills, availability, and cost defined
-        for worker_id in self.workers:
-            if worker_id not in self.worker_skills:
-                errors.append(f"Worker {worker_id} has no skills defined")
-            if worker_id not in self.worker_availability:
-                errors.append(f"Worker {worker_id} has no availability defined")
-            if worker_id not in self.labor_cost:
-                errors.append(f"Worker {worker_id} has no labor cost defined")
+        # Check that all workers have skills, availability, and cost defined.
+        # Set differences find the missing entries; the workers are only
+        # walked (to report them in input order) when something is missing.
+        worker_set = set(self.workers)
+        no_skills = worker_set.difference(self.worker_skills)
+        no_availability = worker_set.difference(self.worker_availability)
+        no_cost = worker_set.difference(self.labor_cost)
+        if no_skills or no_availability or no_cost:
+            for worker_id in self.workers:
+                if worker_id in no_skills:
+                    errors.append(f"Worker {worker_id} has no skills defined")
+                if worker_id in no_availability:
+                    errors.append(f"Worker {worker_id} has no availability defined")
+                if worker_id in no_cost:
+                    errors.append(f"Worker {worker_id} has no labor cost defined")
 
         # Check that all shifts have requirements
-        for shift in self.shifts:
-            if shift.shift_id not in self.shift_requirements:
-                errors.append(f"Shift {shift.shift_id} has no requirements defined")
+        if not self.shift_requirements.keys() >= {shift.shift_id for shift in self.shifts}:
+            errors.extend(
+                f"Shift {shift.shift_id} has no requirements defined"
+                for shift in self.shifts
+                if shift.shift_id not in self.shift_requirements
+            )
 
         return (len(errors) == 0, errors)
 
@@ -257,22 +624,28 @@ class SchedulingInputData:
             "-" * 80
         ]
 
-        for worker_id in self.workers:
-            skills = ', '.join(self.worker_skills.get(worker_id, []))
-            rate = self.labor_cost.get(worker_id, 0)
-            max_hrs = self.max_hours_per_week.get(worker_id, 0)
-            avail_count = len(self.worker_availability.get(worker_id, []))
-            lines.append(
-                f"  {worker_id}: ${rate:.2f}/hr, {max_hrs}h/week max, "
-                f"{avail_count} time slots, Skills: [{skills}]"
-            )
+        # Detail lines are generated straight into the list, one extend each;
+        # the dict lookups are bound once rather than per worker
+        skills_of = self.worker_skills.get
+        rate_of = self.labor_cost.get
+        max_hours_of = self.max_hours_per_week.get
+        availability_of = self.worker_availability.get
+        lines.extend(
+            f"  {worker_id}: ${rate_of(worker_id, 0):.2f}/hr, "
+            f"{max_hours_of(worker_id, 0)}h/week max, "
+            f"{len(availability_of(worker_id, []))} time slots, "
+            f"Skills: [{', '.join(skills_of(worker_id, []))}]"
+            for worker_id in self.workers
+        )
 
         lines.extend(["", "SHIFTS DETAIL:", "-" * 80])
 
-        for shift in self.shifts:
-            reqs = self.shift_requirements.get(shift.shift_id, [])
-            req_str = ', '.join(str(req) for req in reqs)
-            lines.append(f"  {shift} - Duration: {shift.duration_hours}h - Needs: {req_str}")
+        requirements_of = self.shift_requirements.get
+        lines.extend(
+            f"  {shift} - Duration: {shift.duration_hours}h - Needs: "
+            f"{', '.join(map(str, requirements_of(shift.shift_id, [])))}"
+            for shift in self.shifts
+        )
 
         lines.append("=" * 80)
         return '\n'.join(lines)
@@ -615,6 +988,29 @@ def create_sample_healthcare_data() -> SchedulingInputData:
 # TASK 2-5: CP-SAT SCHEDULING MODEL
 # ============================================================================
 
+class GapStopCallback(cp_model.CpSolverSolutionCallback):
+    """
+    Record every improving solution and stop once it is close enough.
+
+    Each solution appends (wall_time, objective, best_bound) to progress, so
+    callers can see how the objective converged. When relative_gap is set,
+    the search stops as soon as (objective - bound) / objective falls to it.
+    """
+
+    def __init__(self, relative_gap: Optional[float] = None):
+        super().__init__()
+        self.relative_gap = relative_gap
+        self.progress: List[Tuple[float, float, float]] = []
+
+    def on_solution_callback(self):
+        objective = self.ObjectiveValue()
+        bound = self.BestObjectiveBound()
+        self.progress.append((self.WallTime(), objective, bound))
+
+        if self.relative_gap is not None and objective - bound <= self.relative_gap * abs(objective):
+            self.StopSearch()
+
+
 class SchedulerModel:
     """
     Complete Constraint Programming model for workforce scheduling using OR-Tools CP-SAT.
@@ -640,10 +1036,22 @@ class SchedulerModel:
         # Decision variables: x[worker_id][shift_id] = 1 if assigned, 0 otherwise
         self.x: Dict[str, Dict[str, cp_model.IntVar]] = {}
 
+        # The same variables on a (workers x shifts) grid indexed by position
+        # in data.workers / data.shifts (None where no variable exists), so
+        # constraint loops walk contiguous rows and columns instead of
+        # probing the nested dicts
+        self.x_grid: Optional[np.ndarray] = None
+        self.x_exists: Optional[np.ndarray] = None
+        # Columns of x_exists packed into per-shift uint64 worker bitsets
+        self.x_exists_bits: Optional[np.ndarray] = None
+
         # Store solution data
         self.solution: Optional[Dict[str, Any]] = None
         self.solve_time: float = 0.0
         self.optimal_cost: float = 0.0
+        # (wall_time, objective, best_bound) of each improving solution found
+        # by the last solve_model call
+        self.solve_progress: List[Tuple[float, float, float]] = []
 
     def create_variables(self):
         """
@@ -656,24 +1064,28 @@ class SchedulerModel:
         Not all combinations are created - only feasible ones (based on availability
         and basic skill matching) to reduce the search space.
         """
-        print("Creating decision variables...")
+        log.info("Creating decision variables...")
 
-        for worker_id in self.data.workers:
-            self.x[worker_id] = {}
+        # Only create variables where the worker is available for the shift
+        # This significantly reduces the problem size
+        self.x_exists = self.data.availability_matrix()
+        self.x_exists_bits = _pack_bits(self.x_exists.T)
+        self.x_grid = np.full(self.x_exists.shape, None, dtype=object)
 
-            for shift in self.data.shifts:
-                shift_id = shift.shift_id
+        for i, worker_id in enumerate(self.data.workers):
+            self.x[worker_id] = {}
 
-                # Only create variable if worker is available for this shift
-                # This significantly reduces the problem size
-                if self.data.worker_can_work_shift(worker_id, shift):
-                    var_name = f"x_{worker_id}_{shift_id}"
-                    self.x[worker_id][shift_id] = self.model.NewBoolVar(var_name)
+            for j in np.flatnonzero(self.x_exists[i]):
+                shift_id = self.data.shifts[j].shift_id
+                var_name = f"x_{worker_id}_{shift_id}"
+                var = self.model.NewBoolVar(var_name)
+                self.x[worker_id][shift_id] = var
+                self.x_grid[i, j] = var
 
         # Count total variables created
         total_vars = sum(len(shifts) for shifts in self.x.values())
-        print(f"  Created {total_vars} decision variables")
-        print(f"  (out of {len(self.data.workers) * len(self.data.shifts)} possible combinations)")
+        log.info("  Created %d decision variables", total_vars)
+        log.info("  (out of %d possible combinations)", len(self.data.workers) * len(self.data.shifts))
 
     def add_hard_constraints(self):
         """
@@ -685,126 +1097,230 @@ class SchedulerModel:
         3. Worker Availability: Workers only assigned to shifts they're available for
         4. No Double Booking: Workers can't be assigned to overlapping shifts
         5. Maximum Hours: Workers can't exceed their weekly hour limit
+
+        Interchangeable workers are then ordered by hours worked to break
+        symmetry (see _add_symmetry_breaking).
         """
-        print("Adding hard constraints...")
+        log.info("Adding hard constraints...")
 
         # ---------------------------------------------------------------------
         # CONSTRAINT 1: SHIFT COVERAGE
         # Each shift must be fully staffed according to its requirements
         # ---------------------------------------------------------------------
-        print("  [1/5] Adding shift coverage constraints...")
+        log.info("  [1/5] Adding shift coverage constraints...")
         coverage_count = 0
 
-        for shift in self.data.shifts:
+        worker_ids = list(self.data.workers)
+
+        for j, shift in enumerate(self.data.shifts):
             shift_id = shift.shift_id
             requirements = self.data.shift_requirements[shift_id]
 
             for req in requirements:
                 # Find all workers who can fill this role
-                eligible_workers = []
-
-                for worker_id in self.data.workers:
-                    # Check if variable exists (worker is available)
-                    if shift_id not in self.x.get(worker_id, {}):
-                        continue
-
-                    # Worker must have BOTH the role AND the required skill (if any)
-                    # Roles like "Cashier", "Stocker", "Supervisor" are stored as skills
-                    has_role = self.data.worker_has_skill(worker_id, req.role)
-                    has_required_skill = self.data.worker_has_skill(worker_id, req.required_skill)
-
-                    if has_role and has_required_skill:
-                        eligible_workers.append(worker_id)
+                eligible_rows = self._eligible_rows(j, req)
 
                 # Constraint: Sum of assigned eligible workers = required count
-                if eligible_workers:
+                if len(eligible_rows):
                     self.model.Add(
-                        sum(self.x[w][shift_id] for w in eligible_workers) == req.count
+                        cp_model.LinearExpr.Sum(self.x_grid[eligible_rows, j].tolist()) == req.count
                     )
                     coverage_count += 1
                 else:
                     # No eligible workers - problem is infeasible
-                    print(f"    WARNING: No eligible workers for {shift_id} - {req}")
+                    log.warning("    WARNING: No eligible workers for %s - %s", shift_id, req)
 
-        print(f"    Added {coverage_count} coverage constraints")
+        log.info("    Added %d coverage constraints", coverage_count)
 
         # ---------------------------------------------------------------------
         # CONSTRAINT 2: ROLE/SKILL MATCH
         # This is implicitly handled by only creating variables for workers
         # with appropriate skills in Constraint 1 above
         # ---------------------------------------------------------------------
-        print("  [2/5] Role/skill matching (implicit in coverage constraints)")
+        log.info("  [2/5] Role/skill matching (implicit in coverage constraints)")
 
         # ---------------------------------------------------------------------
         # CONSTRAINT 3: WORKER AVAILABILITY
         # Workers only assigned when available (implicit - variables only exist
         # for available shifts)
         # ---------------------------------------------------------------------
-        print("  [3/5] Worker availability (implicit in variable creation)")
+        log.info("  [3/5] Worker availability (implicit in variable creation)")
 
         # ---------------------------------------------------------------------
         # CONSTRAINT 4: NO DOUBLE BOOKING
         # A worker cannot be assigned to overlapping shifts
         # ---------------------------------------------------------------------
-        print("  [4/5] Adding no double-booking constraints...")
+        log.info("  [4/5] Adding no double-booking constraints...")
         overlap_count = 0
 
-        for worker_id in self.data.workers:
-            if worker_id not in self.x:
-                continue
-
-            # Check all pairs of shifts this worker could be assigned to
-            assigned_shifts = list(self.x[worker_id].keys())
-
-            for i, shift_id_1 in enumerate(assigned_shifts):
-                shift_1 = self.data.get_shift(shift_id_1)
-
-                for shift_id_2 in assigned_shifts[i+1:]:
-                    shift_2 = self.data.get_shift(shift_id_2)
-
-                    # Check if shifts overlap
-                    if self._shifts_overlap(shift_1, shift_2):
-                        # Constraint: Worker can be assigned to at most one of these shifts
-                        self.model.Add(
-                            self.x[worker_id][shift_id_1] +
-                            self.x[worker_id][shift_id_2] <= 1
-                        )
-                        overlap_count += 1
-
-        print(f"    Added {overlap_count} overlap prevention constraints")
+        shifts = self.data.shifts
+
+        # Which shifts overlap does not depend on the worker: find the
+        # cliques of mutually overlapping shifts once, then restrict each
+        # to the shifts the worker could work
+        cliques = self._overlap_cliques()
+
+        for row, exists in zip(self.x_grid, self.x_exists):
+            worker_cliques = []
+            for last, earlier in cliques:
+                if not exists[last]:
+                    # Its pairs with earlier shifts are covered by their cliques
+                    continue
+                clique = [j for j in earlier if exists[j]]
+                if clique:
+                    clique.append(last)
+                    worker_cliques.append(clique)
+
+            for k, clique in enumerate(worker_cliques):
+                # Skip a clique the next one contains - it adds no constraint
+                if k + 1 < len(worker_cliques) and set(clique) <= set(worker_cliques[k + 1]):
+                    continue
+                # Constraint: Worker can be assigned to at most one of these shifts
+                self.model.AddAtMostOne([row[j] for j in clique])
+                overlap_count += 1
+
+        log.info("    Added %d overlap prevention constraints", overlap_count)
 
         # ---------------------------------------------------------------------
         # CONSTRAINT 5: MAXIMUM HOURS PER WEEK
         # Workers cannot exceed their maximum weekly hours
         # ---------------------------------------------------------------------
-        print("  [5/5] Adding maximum hours constraints...")
+        log.info("  [5/5] Adding maximum hours constraints...")
         hours_count = 0
 
-        for worker_id in self.data.workers:
-            if worker_id not in self.x:
-                continue
+        # Calculate total hours if assigned to each shift
+        # We need to scale to integers for CP-SAT (multiply by 100 to handle decimals)
+        # A shift's scaled hours do not depend on the worker, so compute them once
+        SCALE_FACTOR = 100
+        shift_hours_scaled = (
+            np.array([shift.duration_hours for shift in shifts], dtype=np.float64) * SCALE_FACTOR
+        ).astype(np.int64)
 
+        for worker_id, row, exists in zip(worker_ids, self.x_grid, self.x_exists):
             max_hours = self.data.max_hours_per_week.get(worker_id, 40.0)
+            cols = np.flatnonzero(exists)
 
-            # Calculate total hours if assigned to each shift
-            # We need to scale to integers for CP-SAT (multiply by 100 to handle decimals)
-            SCALE_FACTOR = 100
-            total_hours_scaled = []
-
-            for shift_id in self.x[worker_id]:
-                shift = self.data.get_shift(shift_id)
-                hours_scaled = int(shift.duration_hours * SCALE_FACTOR)
-                total_hours_scaled.append(
-                    self.x[worker_id][shift_id] * hours_scaled
-                )
-
-            if total_hours_scaled:
+            if len(cols):
                 # Constraint: Total hours <= max hours
                 max_hours_scaled = int(max_hours * SCALE_FACTOR)
-                self.model.Add(sum(total_hours_scaled) <= max_hours_scaled)
+                self.model.Add(
+                    cp_model.LinearExpr.WeightedSum(
+                        row[cols].tolist(), shift_hours_scaled[cols].tolist()
+                    ) <= max_hours_scaled
+                )
                 hours_count += 1
 
-        print(f"    Added {hours_count} maximum hours constraints")
+        log.info("    Added %d maximum hours constraints", hours_count)
+
+        self._add_symmetry_breaking(shift_hours_scaled)
+
+    def _interchangeable_classes(self) -> List[List[int]]:
+        """
+        Groups of workers no constraint or cost can tell apart.
+
+        Workers with the same skills (roles included), hourly rate, maximum
+        hours and availability row can swap whole schedules without
+        changing feasibility or cost.
+
+        Returns:
+            Ascending rows of x_grid, one list per group of two or more
+        """
+        groups: Dict[Tuple, List[int]] = {}
+        for i, worker_id in enumerate(self.data.workers):
+            key = (
+                self.data.worker_skill_mask.get(worker_id, 0),
+                self.data.labor_cost[worker_id],
+                self.data.max_hours_per_week.get(worker_id, 40.0),
+                self.x_exists[i].tobytes(),
+            )
+            groups.setdefault(key, []).append(i)
+        return [rows for rows in groups.values() if len(rows) > 1]
+
+    def _add_symmetry_breaking(self, shift_hours_scaled: np.ndarray):
+        """
+        Order interchangeable workers by scaled hours worked.
+
+        Any schedule can be turned into one that satisfies the ordering by
+        handing whole schedules around a group of interchangeable workers,
+        so no optimum is lost; the solver just stops exploring the
+        permutations of the same schedule.
+
+        Args:
+            shift_hours_scaled: Scaled hours of each shift, by column
+        """
+        symmetry_count = 0
+
+        for rows in self._interchangeable_classes():
+            cols = np.flatnonzero(self.x_exists[rows[0]])
+            if not len(cols):
+                continue
+            coeffs = shift_hours_scaled[cols].tolist()
+            hours = [
+                cp_model.LinearExpr.WeightedSum(self.x_grid[i, cols].tolist(), coeffs)
+                for i in rows
+            ]
+            for earlier, later in zip(hours, hours[1:]):
+                self.model.Add(earlier >= later)
+                symmetry_count += 1
+
+        log.info("  Added %d symmetry-breaking constraints between interchangeable workers", symmetry_count)
+
+    def _overlap_cliques(self) -> List[Tuple[int, List[int]]]:
+        """
+        Cliques of mutually overlapping shifts, by a per-day sweep.
+
+        Shifts are visited sorted by (day, start). Each shift, together
+        with the earlier-visited shifts it overlaps, is a clique (they all
+        contain its start time), and every overlapping pair appears in the
+        clique of whichever of the two is visited later. The sweep keeps
+        only the earlier shifts that have not yet ended, so the work is
+        proportional to the overlaps rather than to all pairs.
+
+        Returns:
+            (shift, earlier_overlapping_shifts) per shift with at least one
+            overlap, as positions in data.shifts, in sweep order
+        """
+        shifts = self.data.shifts
+        order = sorted(range(len(shifts)), key=lambda j: (shifts[j].day_idx, shifts[j].start_min))
+
+        cliques = []
+        active: List[int] = []
+        day = None
+        for j in order:
+            shift = shifts[j]
+            if shift.day_idx != day:
+                day, active = shift.day_idx, []
+            else:
+                # Shifts that ended by this start can't overlap it or any later one
+                active = [a for a in active if shifts[a].end_min_wrapped > shift.start_min]
+
+            earlier = [a for a in active if self._shifts_overlap(shifts[a], shift)]
+            if earlier:
+                cliques.append((j, earlier))
+            active.append(j)
+
+        return cliques
+
+    def _eligible_rows(self, shift_index: int, req: ShiftRequirement) -> np.ndarray:
+        """
+        Workers (rows of x_grid) who can fill a requirement of a shift.
+
+        A worker must be available for the shift (have a variable) and hold
+        BOTH the role AND the required skill, if any - roles like "Cashier",
+        "Stocker", "Supervisor" are stored as skills. The three conditions
+        are ANDed as packed worker bitsets, 64 workers per word.
+
+        Args:
+            shift_index: Position of the shift in data.shifts
+            req: One of the shift's requirements
+
+        Returns:
+            Ascending row indices
+        """
+        bits = self.x_exists_bits[shift_index] & self.data.workers_for_requirement(
+            req.role, req.required_skill
+        )
+        return _unpack_indices(bits, len(self.data.workers))
 
     def define_objective(self):
         """
@@ -817,85 +1333,258 @@ class SchedulerModel:
         The CP-SAT solver only handles integer objectives, so we scale costs
         by 100 to handle cents (e.g., $15.50/hr becomes 1550 cents/hr).
         """
-        print("Defining objective function...")
+        log.info("Defining objective function...")
 
         COST_SCALE_FACTOR = 100  # Convert dollars to cents for integer arithmetic
-        cost_terms = []
+        cost_vars = []
+        cost_coeffs = []
+
+        # Calculate cost in cents of every (worker, shift) cell at once:
+        # hourly_rate * duration * 100, truncated like int()
+        rates = np.array([self.data.labor_cost[w] for w in self.data.workers], dtype=np.float64)
+        durations = np.array([s.duration_hours for s in self.data.shifts], dtype=np.float64)
+        cost_cents = (np.outer(rates, durations) * COST_SCALE_FACTOR).astype(np.int64)
+
+        for row, exists, row_cents in zip(self.x_grid, self.x_exists, cost_cents):
+            cols = np.flatnonzero(exists)
+
+            # Add to objective: cost * assignment_variable
+            cost_vars.extend(row[cols].tolist())
+            cost_coeffs.extend(row_cents[cols].tolist())
+
+        # Minimize total cost; WeightedSum builds the expression in one call
+        # instead of chaining a Python-level addition per term
+        if cost_vars:
+            self.model.Minimize(cp_model.LinearExpr.WeightedSum(cost_vars, cost_coeffs))
+            log.info("  Objective defined with %d cost terms", len(cost_vars))
+        else:
+            log.warning("  WARNING: No cost terms in objective function")
 
-        for worker_id in self.data.workers:
-            if worker_id not in self.x:
-                continue
+    def add_greedy_hint(self) -> int:
+        """
+        Seed CP-SAT with a greedy schedule as a solution hint.
 
-            hourly_rate = self.data.labor_cost[worker_id]
+        Shifts are visited by day (in order of first appearance) and start
+        time; each requirement takes the cheapest eligible workers who are
+        not yet on the shift, have hours left, are not booked on an
+        overlapping shift and would not overfill another of the shift's
+        requirements (coverage is an equality). The hint may be incomplete
+        - CP-SAT only uses it as a starting point - but it never breaks the
+        availability, overlap or hour constraints.
 
-            for shift_id in self.x[worker_id]:
-                shift = self.data.get_shift(shift_id)
+        Returns:
+            Number of assignments hinted as 1
+        """
+        log.info("Adding greedy solution hint...")
 
-                # Calculate cost in cents: hourly_rate * duration * 100
-                shift_cost = int(hourly_rate * shift.duration_hours * COST_SCALE_FACTOR)
+        SCALE_FACTOR = 100
+        hours_left = {
+            w: int(self.data.max_hours_per_week.get(w, 40.0) * SCALE_FACTOR)
+            for w in self.data.workers
+        }
+        booked: Dict[str, List[Shift]] = {w: [] for w in self.data.workers}
+        by_rate = sorted(self.data.workers, key=lambda w: self.data.labor_cost[w])
 
-                # Add to objective: cost * assignment_variable
-                cost_terms.append(self.x[worker_id][shift_id] * shift_cost)
+        day_pos: Dict[str, int] = {}
+        for shift in self.data.shifts:
+            day_pos.setdefault(shift.day, len(day_pos))
 
-        # Minimize total cost
-        if cost_terms:
-            self.model.Minimize(sum(cost_terms))
-            print(f"  Objective defined with {len(cost_terms)} cost terms")
-        else:
-            print("  WARNING: No cost terms in objective function")
+        workers = self.data.workers
+        hinted = set()
+        visit_order = sorted(
+            range(len(self.data.shifts)),
+            key=lambda j: (day_pos[self.data.shifts[j].day], self.data.shifts[j].start_min)
+        )
+        for j in visit_order:
+            shift = self.data.shifts[j]
+            shift_id = shift.shift_id
+            hours_scaled = int(shift.duration_hours * SCALE_FACTOR)
+            requirements = self.data.shift_requirements[shift_id]
+
+            # Workers eligible for each requirement, as in the coverage constraint
+            eligible = [{workers[i] for i in self._eligible_rows(j, req)} for req in requirements]
+            filled = [0] * len(requirements)
+            staffed = set()
+
+            for r, req in enumerate(requirements):
+                for worker_id in by_rate:
+                    if filled[r] >= req.count:
+                        break
+                    if worker_id in staffed or worker_id not in eligible[r]:
+                        continue
+                    if hours_left[worker_id] < hours_scaled:
+                        continue
+                    if any(self._shifts_overlap(shift, other) for other in booked[worker_id]):
+                        continue
+                    # A worker counts toward every requirement they are eligible for
+                    counts_toward = [k for k in range(len(requirements)) if worker_id in eligible[k]]
+                    if any(filled[k] >= requirements[k].count for k in counts_toward):
+                        continue
+
+                    for k in counts_toward:
+                        filled[k] += 1
+                    staffed.add(worker_id)
+                    booked[worker_id].append(shift)
+                    hours_left[worker_id] -= hours_scaled
+                    hinted.add((worker_id, shift_id))
+
+        # Hand the greedy schedules around each group of interchangeable
+        # workers so the hint respects the symmetry-breaking order
+        for rows in self._interchangeable_classes():
+            group = [workers[i] for i in rows]
+            ranked = sorted(group, key=lambda w: hours_left[w])
+            for worker_id in group:
+                for shift in booked[worker_id]:
+                    hinted.discard((worker_id, shift.shift_id))
+            for worker_id, source in zip(group, ranked):
+                for shift in booked[source]:
+                    hinted.add((worker_id, shift.shift_id))
+
+        for worker_id, worker_shifts in self.x.items():
+            for shift_id, var in worker_shifts.items():
+                self.model.AddHint(var, 1 if (worker_id, shift_id) in hinted else 0)
+
+        log.info("  Hinted %d assignments", len(hinted))
+        return len(hinted)
+
+    def hint_previous_solution(self) -> int:
+        """
+        Replace the solution hint with the last extracted solution.
+
+        Used when the same model is solved again: the previous schedule is
+        feasible for it, so CP-SAT starts from there instead of from the
+        greedy hint.
+
+        Returns:
+            Number of assignments hinted as 1
+        """
+        assigned = {(a['worker_id'], a['shift_id']) for a in self.solution['assignments']}
+
+        self.model.clear_hints()
+        for worker_id, worker_shifts in self.x.items():
+            for shift_id, var in worker_shifts.items():
+                self.model.AddHint(var, 1 if (worker_id, shift_id) in assigned else 0)
+
+        log.info("  Hinted %d assignments from the previous solution", len(assigned))
+        return len(assigned)
+
+    def clone(self) -> "SchedulerModel":
+        """
+        Copy the built model for a re-solve with other solver settings.
+
+        The CP-SAT model (constraints, objective and hints) is copied at the
+        proto level, so create_variables, add_hard_constraints and
+        define_objective are not run again; only the solver is new. Hints
+        and constraints added to the copy do not touch this model.
+
+        Returns:
+            A SchedulerModel over the same data, ready for solve_model
+        """
+        cloned = SchedulerModel(self.data)
+        cloned.model = self.model.Clone()
+        cloned.x_exists = self.x_exists
+        cloned.x_exists_bits = self.x_exists_bits
+        cloned.x_grid = np.full(self.x_grid.shape, None, dtype=object)
+
+        shift_ids = [s.shift_id for s in self.data.shifts]
+        for i, worker_id in enumerate(self.data.workers):
+            cloned.x[worker_id] = {}
+            for j in np.flatnonzero(self.x_exists[i]):
+                var = cloned.model.GetBoolVarFromProtoIndex(self.x_grid[i, j].Index())
+                cloned.x[worker_id][shift_ids[j]] = var
+                cloned.x_grid[i, j] = var
+
+        return cloned
+
+    def export_model(self, path: str) -> bool:
+        """
+        Write the built CP-SAT model to a file for offline re-runs.
+
+        Args:
+            path: Destination; a name ending in .txt is written as text
+                  proto, anything else as binary
+
+        Returns:
+            True if the file was written
+        """
+        return self.model.ExportToFile(path)
 
-    def solve_model(self, time_limit_seconds: int = 30) -> bool:
+    def solve_model(
+        self,
+        time_limit_seconds: int = 30,
+        num_workers: Optional[int] = None,
+        tune_params: Optional[Dict[str, Any]] = None,
+        relative_gap: Optional[float] = None
+    ) -> bool:
         """
         TASK 5: Solve the scheduling problem.
 
         Args:
             time_limit_seconds: Maximum time to spend searching for a solution
+            num_workers: Parallel CP-SAT search workers (default: one per
+                CPU, capped at 16)
+            tune_params: CP-SAT SatParameters fields to set, applied on top
+                of DEFAULT_SOLVER_PARAMS (e.g. {"linearization_level": 1})
+            relative_gap: Stop as soon as a solution is proven within this
+                fraction of optimal (e.g. 0.01); None searches to optimality
+                or the time limit
 
         Returns:
             True if an optimal or feasible solution was found, False otherwise
         """
-        print("\n" + "=" * 80)
-        print("SOLVING SCHEDULING PROBLEM")
-        print("=" * 80)
+        log.info("\n" + "=" * 80)
+        log.info("SOLVING SCHEDULING PROBLEM")
+        log.info("=" * 80)
 
         # Configure solver
         self.solver.parameters.max_time_in_seconds = time_limit_seconds
         self.solver.parameters.log_search_progress = False  # Set to True for debugging
 
+        # CP-SAT runs a portfolio of searches, one per worker
+        if num_workers is None:
+            num_workers = min(os.cpu_count() or 4, 16)
+        self.solver.parameters.num_workers = num_workers
+        self.solver.parameters.random_seed = 1
+
+        for name, value in {**DEFAULT_SOLVER_PARAMS, **(tune_params or {})}.items():
+            setattr(self.solver.parameters, name, value)
+
         # Solve
-        print(f"Running CP-SAT solver (time limit: {time_limit_seconds}s)...")
+        log.info("Running CP-SAT solver (time limit: %ss)...", time_limit_seconds)
         import time
         start_time = time.time()
 
-        status = self.solver.Solve(self.model)
+        callback = GapStopCallback(relative_gap)
+        status = self.solver.Solve(self.model, callback)
 
         self.solve_time = time.time() - start_time
+        self.solve_progress = callback.progress
 
         # Process results
-        print(f"Solve time: {self.solve_time:.2f} seconds")
-        print(f"Status: {self.solver.StatusName(status)}")
+        log.info("Solve time: %.2f seconds", self.solve_time)
+        log.info("Status: %s", self.solver.StatusName(status))
 
         if status == cp_model.OPTIMAL:
-            print("✓ OPTIMAL solution found!")
+            log.info("✓ OPTIMAL solution found!")
             self._extract_solution()
             return True
 
         elif status == cp_model.FEASIBLE:
-            print("✓ FEASIBLE solution found (may not be optimal)")
+            log.info("✓ FEASIBLE solution found (may not be optimal)")
             self._extract_solution()
             return True
 
         elif status == cp_model.INFEASIBLE:
-            print("✗ INFEASIBLE - No valid schedule exists")
-            print("\nThis indicates the problem is over-constrained:")
-            print("  - Too few workers")
-            print("  - Insufficient skills in workforce")
-            print("  - Conflicting availability and shift requirements")
-            print("\nUse scheduling_diagnostics.py to analyze the failure!")
+            log.warning("✗ INFEASIBLE - No valid schedule exists")
+            log.warning("\nThis indicates the problem is over-constrained:")
+            log.warning("  - Too few workers")
+            log.warning("  - Insufficient skills in workforce")
+            log.warning("  - Conflicting availability and shift requirements")
+            log.warning("\nUse scheduling_diagnostics.py to analyze the failure!")
             return False
 
         else:
-            print(f"✗ Solver terminated with status: {self.solver.StatusName(status)}")
+            log.warning("✗ Solver terminated with status: %s", self.solver.StatusName(status))
             return False
 
     def _extract_solution(self):
@@ -908,23 +1597,24 @@ class SchedulerModel:
         # Extract assignments
         assignments = []
         worker_hours = {w: 0.0 for w in self.data.workers}
+        assignments_by_worker = {w: [] for w in self.data.workers}
         shift_assignments = {s.shift_id: [] for s in self.data.shifts}
 
-        for worker_id in self.data.workers:
-            if worker_id not in self.x:
-                continue
-
-            for shift_id in self.x[worker_id]:
-                if self.solver.Value(self.x[worker_id][shift_id]) == 1:
-                    shift = self.data.get_shift(shift_id)
+        for worker_id, row, exists in zip(self.data.workers, self.x_grid, self.x_exists):
+            for j in np.flatnonzero(exists):
+                if self.solver.Value(row[j]) == 1:
+                    shift = self.data.shifts[j]
+                    shift_id = shift.shift_id
                     cost = self.data.labor_cost[worker_id] * shift.duration_hours
 
-                    assignments.append({
+                    assignment = {
                         'worker_id': worker_id,
                         'shift_id': shift_id,
                         'shift': shift,
                         'cost': cost
-                    })
+                    }
+                    assignments.append(assignment)
+                    assignments_by_worker[worker_id].append(assignment)
 
                     worker_hours[worker_id] += shift.duration_hours
                     shift_assignments[shift_id].append(worker_id)
@@ -932,6 +1622,53 @@ class SchedulerModel:
         self.solution = {
             'assignments': assignments,
             'worker_hours': worker_hours,
+            'assignments_by_worker': assignments_by_worker,
+            'shift_assignments': shift_assignments,
+            'total_cost': self.optimal_cost,
+            'solve_time': self.solve_time
+        }
+
+    def adopt_solutions(self, partial_solutions: List[Dict[str, Any]], solve_time: float):
+        """
+        Install the union of independent sub-problem solutions as this
+        model's solution (see SchedulingInputData.split_by_day).
+
+        Assignments are ordered and totalled exactly as _extract_solution
+        would for the combined problem.
+
+        Args:
+            partial_solutions: Solutions of the sub-problems, as produced by
+                               _extract_solution on each sub-model
+            solve_time: Wall-clock time spent solving all sub-problems
+        """
+        COST_SCALE_FACTOR = 100
+
+        worker_pos = {w: i for i, w in reversed(list(enumerate(self.data.workers)))}
+        shift_pos = {s.shift_id: i for i, s in reversed(list(enumerate(self.data.shifts)))}
+        assignments = sorted(
+            (a for solution in partial_solutions for a in solution['assignments']),
+            key=lambda a: (worker_pos[a['worker_id']], shift_pos[a['shift_id']])
+        )
+
+        worker_hours = {w: 0.0 for w in self.data.workers}
+        assignments_by_worker = {w: [] for w in self.data.workers}
+        shift_assignments = {s.shift_id: [] for s in self.data.shifts}
+        for assignment in assignments:
+            worker_hours[assignment['worker_id']] += assignment['shift'].duration_hours
+            assignments_by_worker[assignment['worker_id']].append(assignment)
+            shift_assignments[assignment['shift_id']].append(assignment['worker_id'])
+
+        # Objective values are integer cents; sum them before scaling back
+        total_cents = sum(
+            round(solution['total_cost'] * COST_SCALE_FACTOR) for solution in partial_solutions
+        )
+        self.optimal_cost = total_cents / COST_SCALE_FACTOR
+        self.solve_time = solve_time
+
+        self.solution = {
+            'assignments': assignments,
+            'worker_hours': worker_hours,
+            'assignments_by_worker': assignments_by_worker,
             'shift_assignments': shift_assignments,
             'total_cost': self.optimal_cost,
             'solve_time': self.solve_time
@@ -948,23 +1685,15 @@ class SchedulerModel:
         Returns:
             True if shifts overlap, False otherwise
         """
-        if shift1.day != shift2.day:
+        if shift1.day_idx != shift2.day_idx:
             return False
 
-        # Parse times
-        start1 = datetime.strptime(shift1.start_time, "%H:%M")
-        end1 = datetime.strptime(shift1.end_time, "%H:%M")
-        start2 = datetime.strptime(shift2.start_time, "%H:%M")
-        end2 = datetime.strptime(shift2.end_time, "%H:%M")
-
-        # Handle overnight shifts
-        if end1 < start1:
-            end1 += timedelta(days=1)
-        if end2 < start2:
-            end2 += timedelta(days=1)
-
         # Check overlap: shifts overlap if start1 < end2 AND start2 < end1
-        return start1 < end2 and start2 < end1
+        # (end times are already wrapped past midnight for overnight shifts)
+        return (
+            shift1.start_min < shift2.end_min_wrapped
+            and shift2.start_min < shift1.end_min_wrapped
+        )
 
     def print_solution(self):
         """Print a human-readable schedule."""
@@ -984,10 +1713,7 @@ class SchedulerModel:
         print("-" * 80)
 
         for worker_id in sorted(self.data.workers):
-            worker_shifts = [
-                a for a in self.solution['assignments']
-                if a['worker_id'] == worker_id
-            ]
+            worker_shifts = self.solution['assignments_by_worker'][worker_id]
 
             if worker_shifts:
                 total_hours = self.solution['worker_hours'][worker_id]
@@ -1057,6 +1783,8 @@ def main():
     """
     Demonstrate the input data structure definition with sample scenarios.
     """
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
     print("=" * 80)
     print("WORKFORCE SCHEDULING ENGINE - INPUT DATA STRUCTURES")
     print("=" * 80)